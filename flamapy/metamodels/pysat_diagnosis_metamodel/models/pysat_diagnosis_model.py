@@ -1,9 +1,8 @@
-from typing import List, Dict
+from typing import Iterable, List, Dict
 
 from flamapy.metamodels.configuration_metamodel.models import Configuration
 
-from flamapy.metamodels.pysat_metamodel.models import PySATModel
-from flamapy.metamodels.fm_metamodel.models.feature_model import Feature
+from flamapy.metamodels.pysat_metamodel.models import PySATClauses, PySATModel
 
 
 class DiagnosisModel(PySATModel):
@@ -39,14 +38,14 @@ class DiagnosisModel(PySATModel):
         # background knowledge (i.e., the knowledge that is known to be true)
         self.set_b: List[int] = []
         # set of all CNF with added assumptions
-        self.set_kb: List[List[int]] = []
+        self.set_kb = PySATClauses()
         # map clauses to relationships/constraint
-        self.constraint_map: Dict[str, List[List[int]]] = {}
+        self.constraint_map: Dict[str, PySATClauses] = {}
         # map id of assumptions to relationships/constraint
         self.constraint_assumption_map: Dict[int, str] = {}
 
-    def add_clause_to_map(self, description: str, clauses: List[List[int]]) -> None:
-        self.constraint_map[description] = clauses
+    def add_clause_to_map(self, description: str, clauses: Iterable[Iterable[int]]) -> None:
+        self.constraint_map[description] = PySATClauses(clauses)
 
     def get_c(self) -> List[int]:
         return self.set_c
@@ -54,7 +53,7 @@ class DiagnosisModel(PySATModel):
     def get_b(self) -> List[int]:
         return self.set_b
 
-    def get_kb(self) -> List[List[int]]:
+    def get_kb(self) -> PySATClauses:
         return self.set_kb
 
     def get_pretty_diagnoses(self, assumptions: List[List[int]]) -> str:
@@ -118,7 +117,8 @@ class DiagnosisModel(PySATModel):
                              test_case: Configuration = None) -> None:
         assumption: List[int] = []
 
-        id_assumption = len(self.variables) + 1
+        # assumption ids follow every variable of the CNF, auxiliary ones included
+        id_assumption = max(len(self.variables), self.get_all_clauses().nv) + 1
         id_assumption = self._prepare_assumptions_for_kb(assumption, id_assumption)
 
         start_id_configuration = len(assumption)
@@ -150,46 +150,30 @@ class DiagnosisModel(PySATModel):
         for _, key in enumerate(cstr_map):
             # get clauses
             clauses = cstr_map[key]
-            # loop through all variables in the constraint
-            for _, clause in enumerate(clauses):
-                # add the assumption variable to the clause
-                # assumption => clause
-                # i.e., -assumption v clause
-                clause.append(-1 * id_assumption)
+            # add the assumption variable to every clause of the constraint
+            # assumption => clause
+            # i.e., -assumption v clause
+            self.set_kb.extend(clause + [-1 * id_assumption] for clause in clauses)
 
             assumption.append(id_assumption)
-            self.set_kb.extend(clauses)
             self.constraint_assumption_map[id_assumption] = key
 
             id_assumption += 1
 
         return id_assumption
 
-    def _convert_keys_to_features(self, configuration: 'Configuration') -> 'Configuration':
-        new_elements = {Feature(key) if isinstance(key, str)
-                        else key: value for key, value 
-                        in configuration.elements.items()}
-        return Configuration(new_elements)
-
     def _prepare_assumptions_for_configuration(self, assumption: List[int],
                                                configuration: Configuration,
                                                id_assumption: int) -> int:
-        configuration = self._convert_keys_to_features(configuration)
-        config = [feat.name for feat in configuration.elements]
-        for feat in config:
-            if feat not in self.variables.keys():
-                raise KeyError(f'Feature {feat} is not in the model.')
-
-        for feat, value in configuration.elements.items():
-            desc = ''
-            clause = []
-
-            if value:
-                desc = f'{feat.name} = true'
-                clause = [self.variables[feat.name], -1 * id_assumption]
-            else:
-                desc = f'{feat.name} = false'
-                clause = [-1 * self.variables[feat.name], -1 * id_assumption]
+        literals, missing = self.configuration_to_assumptions(configuration)
+        if missing:
+            feat = missing[0] if isinstance(missing[0], str) else missing[0].name
+            raise KeyError(f'Feature {feat} is not in the model.')
+
+        for literal in literals:
+            name = self.features[abs(literal)]
+            desc = f'{name} = true' if literal > 0 else f'{name} = false'
+            clause = [literal, -1 * id_assumption]
 
             assumption.append(id_assumption)
             self.set_kb.append(clause)
@@ -1,9 +1,13 @@
 from .checker import ConsistencyChecker
 from .fastdiag import FastDiag
+from .fastdiagp import FastDiagP
 from .quickxplain import QuickXPlain
+from .quickxplainp import QuickXPlainP
 
 __all__ = [
     "ConsistencyChecker",
     "FastDiag",
-    "QuickXPlain"
+    "FastDiagP",
+    "QuickXPlain",
+    "QuickXPlainP"
 ]
\ No newline at end of file
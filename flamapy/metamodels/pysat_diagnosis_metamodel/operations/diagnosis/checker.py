@@ -2,17 +2,44 @@
 A Java version of this implementation is available at:
 https://github.com/HiConfiT/hiconfit-core/blob/main/ca-cdr-package/src/main/java/at/tugraz/ist/ase/cacdr/checker/ChocoConsistencyChecker.java
 """
-from typing import List
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, FrozenSet, Iterable, List, Optional, Tuple
 
 from pysat.solvers import Solver
 
 
 class ConsistencyChecker:
+    """
+    Consistency checks of assumptions against a knowledge base.
 
-    def __init__(self, solver_name: str, set_kb: List[List[int]]) -> None:
+    Every check also gives a witness: a model of the knowledge base satisfying the
+    assumptions if they are consistent, or an unsat core (a subset of the assumptions that is
+    already inconsistent) otherwise. The witnesses are memoized: a model answers the checks
+    of all the assumption sets it satisfies, and a core those of all the assumption sets
+    containing it. At most `cache_size` witnesses of each kind are kept, evicting the least
+    recently used one (0 disables memoization); `hits` counts the checks answered from the
+    memo and `misses` those answered by the solver.
+
+    A lookup scans the memo, i.e., up to 2 * `cache_size` subset tests per check. On easy
+    knowledge bases, where a solver call takes some tens of microseconds, a large memo costs
+    more than the calls it saves; raise `cache_size` when the solver calls are expensive.
+    """
+
+    def __init__(self, solver_name: str, set_kb: Iterable[List[int]],
+                 cache_size: int = 128) -> None:
         self.result = False
+        self.solver_name = solver_name
+        self.set_kb = set_kb
 
         self.solver = Solver(solver_name, bootstrap_with=set_kb)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._models: OrderedDict[FrozenSet[int], None] = OrderedDict()
+        self._cores: OrderedDict[FrozenSet[int], None] = OrderedDict()
 
     def is_consistent(self, set_c: List[int], delta: List[int]) -> bool:
         """
@@ -21,10 +48,90 @@ class ConsistencyChecker:
         :param delta: a list of assumptions should not be added to the CNF formula
         :return: a boolean value indicating whether the given CNF formula is consistent
         """
+        return self.check(set_c, delta)[0]
+
+    def check(self, set_c: List[int], delta: List[int]) -> Tuple[bool, List[int]]:
+        """
+        Check if the given CNF formula is consistent, and return the witness of the answer.
+        :param set_c: a list of assumptions should be added to the CNF formula
+        :param delta: a list of assumptions should not be added to the CNF formula
+        :return: whether the given CNF formula is consistent, and a model (consistent) or an
+            unsat core (inconsistent)
+        """
         assumptions = set_c + [-1 * item for item in delta]
+        key = frozenset(assumptions)
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            self.result = cached[0]
+            return cached
+        self.misses += 1
         self.result = self.solver.solve(assumptions=assumptions)
         # print(f"assumptions: {assumptions} - result: {self.result}")
-        return self.result
+        witness = (self.solver.get_model() if self.result else self.solver.get_core()) or []
+        self._store(frozenset(witness), self.result)
+        return self.result, witness
+
+    def _lookup(self, key: FrozenSet[int]) -> Optional[Tuple[bool, List[int]]]:
+        for model in reversed(self._models):
+            if key <= model:
+                self._models.move_to_end(model)
+                return True, sorted(model, key=abs)
+        for core in reversed(self._cores):
+            if core <= key:
+                self._cores.move_to_end(core)
+                return False, sorted(core, key=abs)
+        return None
+
+    def _store(self, witness: FrozenSet[int], result: bool) -> None:
+        if self.cache_size <= 0:
+            return
+        known = self._models if result else self._cores
+        known[witness] = None
+        known.move_to_end(witness)
+        if len(known) > self.cache_size:
+            known.popitem(last=False)
+
+    def submit(self, set_c: List[int], delta: List[int], processes: int) -> 'Future[bool]':
+        """
+        Check asynchronously if the given CNF formula is consistent, in a pool of worker
+        processes, each owning a ConsistencyChecker of the same knowledge base.
+        The pool is started on the first call (with `processes` workers) and kept until
+        `delete` is called.
+        :param set_c: a list of assumptions should be added to the CNF formula
+        :param delta: a list of assumptions should not be added to the CNF formula
+        :param processes: the number of worker processes of the pool
+        :return: a future of the boolean value indicating whether it is consistent
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=processes,
+                                             initializer=_init_worker,
+                                             initargs=(self.solver_name, self.set_kb))
+        return self._pool.submit(_is_consistent, set_c, delta)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        A pickled checker (e.g., sent to a worker process) is rebuilt as a new checker of the
+        same knowledge base, solver and cache size: its own solver, an empty memo (the
+        models, cores and hit/miss counters are not copied) and no worker pool.
+        """
+        return ConsistencyChecker, (self.solver_name, self.set_kb, self.cache_size)
 
     def delete(self) -> None:
-        self.solver.delete()
\ No newline at end of file
+        self.solver.delete()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+_CHECKER: Optional[ConsistencyChecker] = None  # checker of the current worker process
+
+
+def _init_worker(solver_name: str, set_kb: Iterable[List[int]]) -> None:
+    global _CHECKER  # pylint: disable=global-statement
+    _CHECKER = ConsistencyChecker(solver_name, set_kb)
+
+
+def _is_consistent(set_c: List[int], delta: List[int]) -> bool:
+    assert _CHECKER is not None
+    return bool(_CHECKER.is_consistent(set_c, delta))
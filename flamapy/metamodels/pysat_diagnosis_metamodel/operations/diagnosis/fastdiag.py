@@ -4,7 +4,7 @@ https://github.com/HiConfiT/hiconfit-core/blob/main/ca-cdr-package/src/main/java
 """
 
 import logging
-from typing import List
+from typing import List, Tuple
 
 from .checker import ConsistencyChecker
 from .utils import split, diff
@@ -37,13 +37,23 @@ class FastDiag:
         # print(f'fastDiag [C={C}, B={B}]')
 
         # if isEmpty(C) or consistent(B U C) return Φ
-        if len(set_c) == 0 or self.checker.is_consistent(set_b + set_c, []):
+        if len(set_c) == 0:
+            logging.debug('return Φ')
+            return []
+        consistent, core = self.checker.check(set_b + set_c, [])
+        if consistent:
             logging.debug('return Φ')
             # print('return Φ')
             return []
 
         # return C \ FD(C, B, Φ)
-        mss = self._fd([], set_c, set_b)
+        excluded, remaining = _exclude_by_core(set_c, set_b, core)
+        if len(excluded) == 0:
+            mss = self._fd([], set_c, set_b)
+        elif len(remaining) == 0:
+            mss = []
+        else:
+            mss = self._fd(excluded, remaining, set_b)
         diag = diff(set_c, mss)
 
         logging.debug('return %s', diag)
@@ -71,9 +81,18 @@ class FastDiag:
         logging.debug('>>> FD [Δ=%s, C=%s, B=%s]', delta, set_c, set_b)
 
         # if Δ != Φ and consistent(B U C) return C;
-        if len(delta) != 0 and self.checker.is_consistent(set_b + set_c, delta):
-            logging.debug('<<< return %s', set_c)
-            return set_c
+        if len(delta) != 0:
+            consistent, core = self.checker.check(set_b + set_c, delta)
+            if consistent:
+                logging.debug('<<< return %s', set_c)
+                return set_c
+            # a constraint inconsistent with B is in no MSS: search without it
+            excluded, remaining = _exclude_by_core(set_c, set_b, core)
+            if len(excluded) != 0:
+                logging.debug('exclude %s', excluded)
+                if len(remaining) == 0:
+                    return []
+                return self._fd(delta + excluded, remaining, set_b)
 
         # if singleton(C) return Φ;
         if len(set_c) == 1:
@@ -92,4 +111,17 @@ class FastDiag:
         logging.debug('<<< return [Δ1={Δ1} ∪ Δ2={Δ2}]')
 
         # return Δ1 + Δ2
-        return delta1 + delta2
\ No newline at end of file
+        return delta1 + delta2
+
+
+def _exclude_by_core(set_c: List[int], set_b: List[int],
+                     core: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    Returns the constraint of C that is inconsistent with B according to the unsat core
+    (if the core is made of constraints of B and only one of C), and the rest of C.
+    """
+    constraints_c = set(set_c)
+    in_c = [item for item in core if item in constraints_c]
+    if len(in_c) != 1 or not set(core).issubset(constraints_c.union(set_b)):
+        return [], set_c
+    return in_c, [item for item in set_c if item != in_c[0]]
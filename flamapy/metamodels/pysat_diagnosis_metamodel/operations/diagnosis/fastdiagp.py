@@ -0,0 +1,88 @@
+import logging
+from typing import List, Optional
+
+from .checker import ConsistencyChecker
+from .fastdiag import FastDiag
+from .lookahead import Continuation, LookaheadChecks, done
+from .utils import split, diff
+
+
+class FastDiagP(FastDiag):
+    """
+    Implementation of FastDiagP, the parallelized version of the MSS-based FastDiag algorithm.
+    Le, V. M., Silva, C. V., Felfernig, A., Benavides, D., Galindo, J., & Tran, T. N. T. (2023).
+    FastDiagP: An Algorithm for Parallelized Direct Diagnosis.
+    arXiv preprint arXiv:2305.06951.
+
+    Before waiting for a consistency check that is not available yet, a lookahead explores
+    the checks FD may need next, assuming each pending check to be consistent and then
+    inconsistent, and submits up to `max_lookahead` of them to the worker processes of the
+    checker. The results are kept in a cache consumed by the following checks, so FD
+    computes the same diagnosis as FastDiag.
+    """
+
+    def __init__(self, checker: ConsistencyChecker,
+                 processes: Optional[int] = None,
+                 max_lookahead: Optional[int] = None) -> None:
+        super().__init__(checker)
+        self.checks = LookaheadChecks(checker, processes, max_lookahead)
+
+    def _fd(self, delta: List[int], set_c: List[int], set_b: List[int],
+            then: Continuation = done) -> List[int]:
+        """
+        The FD function of FastDiag, where every consistency check is taken from the cache.
+        :param then: the rest of the computation after this call, for the lookahead
+        """
+        logging.debug('>>> FD [Δ=%s, C=%s, B=%s]', delta, set_c, set_b)
+
+        # if Δ != Φ and consistent(B U C) return C;
+        if len(delta) != 0 and self.checks.is_consistent(
+                set_b + set_c, delta, lambda: self._lookahead(delta, set_c, set_b, then)):
+            logging.debug('<<< return %s', set_c)
+            return set_c
+
+        # if singleton(C) return Φ;
+        if len(set_c) == 1:
+            logging.debug('<<< return Φ')
+            return []
+
+        # C1 = {c1..ck}; C2 = {ck+1..cn};
+        set_c1, set_c2 = split(set_c)
+
+        # Δ1 = FD(C2, C1, B);
+        delta1 = self._fd(set_c2, set_c1, set_b,
+                          lambda d1: self._lookahead(diff(set_c1, d1), set_c2, set_b + d1,
+                                                     lambda d2: then(d1 + d2)))
+        # Δ2 = FD(C1 - Δ1, C2, B U Δ1);
+        delta2 = self._fd(diff(set_c1, delta1), set_c2, set_b + delta1,
+                          lambda d2: then(delta1 + d2))
+
+        logging.debug('<<< return [Δ1=%s ∪ Δ2=%s]', delta1, delta2)
+
+        # return Δ1 + Δ2
+        return delta1 + delta2
+
+    def _lookahead(self, delta: List[int], set_c: List[int], set_b: List[int],
+                   then: Continuation) -> None:
+        """
+        Submit the consistency checks of FD(Δ, C, B) followed by `then`, for both outcomes
+        of the checks whose result is not known yet.
+        """
+        if not self.checks.visit():
+            return
+
+        if len(delta) != 0:
+            consistent = self.checks.speculate(set_b + set_c, delta)
+            if consistent is not False:
+                then(set_c)
+            if consistent is True:
+                return
+
+        if len(set_c) == 1:
+            then([])
+            return
+
+        set_c1, set_c2 = split(set_c)
+        self._lookahead(set_c2, set_c1, set_b,
+                        lambda d1: self._lookahead(diff(set_c1, d1), set_c2, set_b + d1,
+                                                   lambda d2: then(d1 + d2)))
@@ -1,8 +1,10 @@
 from .hsdag import HSDAG
 from .node import Node, NodeStatus
+from .parallel_hsdag import ParallelHSDAG
 
 __all__ = [
     'HSDAG',
     'Node',
-    'NodeStatus'
+    'NodeStatus',
+    'ParallelHSDAG'
 ]
\ No newline at end of file
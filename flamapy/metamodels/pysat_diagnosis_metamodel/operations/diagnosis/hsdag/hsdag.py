@@ -123,7 +123,7 @@ class HSDAG:
 
         # compute labels if there are none to reuse
         if len(labels) == 0:
-            labels = self.compute_label_from_node(self.labeler, node)
+            labels = self.compute_node_label(node)
 
             self.process_labels(labels)
 
@@ -173,6 +173,12 @@ class HSDAG:
     def compute_label(labeler: IHSLabelable, param: AbstractHSParameters) -> List[List[int]]:
         return labeler.get_label(param)
 
+    def compute_node_label(self, node: Node) -> List[List[int]]:
+        """
+        Computes the labels of a node that cannot reuse a label (a hook for subclasses).
+        """
+        return self.compute_label_from_node(self.labeler, node)
+
     @staticmethod
     def compute_label_from_node(labeler: IHSLabelable, node: Node) -> List[List[int]]:
         param = node.parameters
@@ -1,6 +1,6 @@
-from .fastdiag_labeler import FastDiagParameters, FastDiagLabeler
+from .fastdiag_labeler import FastDiagParameters, FastDiagLabeler, FastDiagPLabeler
 from .labeler import IHSLabelable, AbstractHSParameters, LabelerType
-from .quickxplain_labeler import QuickXPlainParameters, QuickXPlainLabeler
+from .quickxplain_labeler import QuickXPlainParameters, QuickXPlainLabeler, QuickXPlainPLabeler
 
 __all__ = [
     'IHSLabelable',
@@ -8,6 +8,8 @@ __all__ = [
     'LabelerType',
     'FastDiagParameters',
     'FastDiagLabeler',
+    'FastDiagPLabeler',
     'QuickXPlainParameters',
-    'QuickXPlainLabeler'
+    'QuickXPlainLabeler',
+    'QuickXPlainPLabeler'
 ]
\ No newline at end of file
@@ -4,11 +4,12 @@ https://github.com/HiConfiT/hiconfit-core/blob/main/ca-cdr-package/src/main/java
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from .labeler import IHSLabelable, LabelerType, AbstractHSParameters
 from ...checker import ConsistencyChecker
 from ...fastdiag import FastDiag
+from ...fastdiagp import FastDiagP
 
 
 @dataclass
@@ -69,3 +70,20 @@ class FastDiagLabeler(FastDiag, IHSLabelable):
 
     def get_instance(self, checker: ConsistencyChecker) -> IHSLabelable:
         return FastDiagLabeler(checker, self.initial_parameters)
+
+
+class FastDiagPLabeler(FastDiagLabeler):
+    """
+    HSLabeler for FastDiagP algorithm (FastDiag with parallel lookahead consistency checks)
+    """
+
+    def __init__(self, checker: ConsistencyChecker, parameters: FastDiagParameters,
+                 processes: Optional[int] = None):
+        super().__init__(checker, parameters)
+        self.fastdiagp = FastDiagP(checker, processes)
+
+    def find_diagnosis(self, set_c: List[int], set_b: List[int]) -> List[int]:
+        return self.fastdiagp.find_diagnosis(set_c, set_b)
+
+    def get_instance(self, checker: ConsistencyChecker) -> IHSLabelable:
+        return FastDiagPLabeler(checker, self.initial_parameters, self.fastdiagp.checks.processes)
@@ -4,11 +4,12 @@ https://github.com/HiConfiT/hiconfit-core/blob/main/ca-cdr-package/src/main/java
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from .labeler import IHSLabelable, LabelerType, AbstractHSParameters
 from ...checker import ConsistencyChecker
 from ...quickxplain import QuickXPlain
+from ...quickxplainp import QuickXPlainP
 
 
 @dataclass
@@ -67,3 +68,21 @@ class QuickXPlainLabeler(QuickXPlain, IHSLabelable):
 
     def get_instance(self, checker: ConsistencyChecker) -> 'IHSLabelable':
         return QuickXPlainLabeler(checker, self.initial_parameters)
+
+
+class QuickXPlainPLabeler(QuickXPlainLabeler):
+    """
+    HSLabeler for QuickXPlainP algorithm (QuickXPlain with parallel lookahead consistency checks)
+    """
+
+    def __init__(self, checker: ConsistencyChecker, parameters: QuickXPlainParameters,
+                 processes: Optional[int] = None):
+        super().__init__(checker, parameters)
+        self.quickxplainp = QuickXPlainP(checker, processes)
+
+    def find_conflict(self, set_c: List[int], set_b: List[int]) -> List[int]:
+        return self.quickxplainp.find_conflict(set_c, set_b)
+
+    def get_instance(self, checker: ConsistencyChecker) -> 'IHSLabelable':
+        return QuickXPlainPLabeler(checker, self.initial_parameters,
+                                   self.quickxplainp.checks.processes)
@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from .hsdag import HSDAG, HSDAGException
+from .labeler.labeler import IHSLabelable, AbstractHSParameters
+from .node import Node, NodeStatus
+from ..checker import ConsistencyChecker
+
+
+class ParallelHSDAG(HSDAG):
+    """
+    HS-dag whose nodes are labeled level by level in a pool of worker processes.
+
+    When a node of a level has to be labeled, the labels of all the nodes of its level that
+    still need one are computed at once, each worker owning a labeler (obtained from
+    `get_instance`) and its own consistency checker. The labels are then consumed in the
+    order of the sequential construction, so the HS-dag, its diagnoses and conflicts, and
+    the limits on their number and on the depth are the same as with HSDAG.
+
+    The workers cannot start processes of their own: if `labeler` runs its consistency
+    checks in a pool (FastDiagP, QuickXPlainP), give a sequential `worker_labeler` with the
+    same parameters, used by the workers instead.
+    """
+
+    def __init__(self, labeler: IHSLabelable, checker: ConsistencyChecker,
+                 processes: int, worker_labeler: Optional[IHSLabelable] = None) -> None:
+        super().__init__(labeler)
+        self.checker = checker
+        self.worker_labeler = worker_labeler if worker_labeler is not None else labeler
+        self.processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._computed: Dict[int, List[List[int]]] = {}  # node id -> computed labels
+
+    def construct(self) -> None:
+        try:
+            super().construct()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+            self._computed.clear()
+
+    def compute_node_label(self, node: Node) -> List[List[int]]:
+        if node.parameters is None:
+            raise HSDAGException("The node must have parameters.")
+        if node.node_id not in self._computed:
+            level = [node] + [other for other in self.open_nodes
+                              if other.level == node.level and self._needs_label(other)]
+            self._compute_labels(level)
+        return self._computed.pop(node.node_id)
+
+    def _needs_label(self, node: Node) -> bool:
+        # a node that the sequential construction would label with a computed label
+        # (without the pruning checks, which change the nodes)
+        return (node.status == NodeStatus.OPEN
+                and node.parameters is not None
+                and (self.max_depth == 0 or node.level <= self.max_depth)
+                and node.node_id not in self._computed
+                and len(self.get_reusable_labels(node)) == 0)
+
+    def _compute_labels(self, nodes: List[Node]) -> None:
+        if self._pool is None:
+            labeler = self.worker_labeler.get_instance(self.checker)
+            self._pool = ProcessPoolExecutor(max_workers=self.processes,
+                                             initializer=_init_worker,
+                                             initargs=(labeler,))
+        parameters = [node.parameters for node in nodes]
+        for node, labels in zip(nodes, self._pool.map(_get_label, parameters)):
+            self._computed[node.node_id] = labels
+
+
+_LABELER: Optional[IHSLabelable] = None  # labeler of the current worker process
+
+
+def _init_worker(labeler: IHSLabelable) -> None:
+    global _LABELER  # pylint: disable=global-statement
+    _LABELER = labeler
+
+
+def _get_label(parameters: AbstractHSParameters) -> List[List[int]]:
+    assert _LABELER is not None
+    return _LABELER.get_label(parameters)
@@ -0,0 +1,71 @@
+"""Provides the speculative consistency checks of the parallelized algorithms."""
+import logging
+import os
+from concurrent.futures import Future
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .checker import ConsistencyChecker
+
+
+Continuation = Callable[[List[int]], None]
+
+
+def done(_: List[int]) -> None:
+    """The continuation of a top-level call: nothing follows it."""
+
+
+class LookaheadChecks:
+    """
+    Consistency checks evaluated ahead of time in the worker pool of a ConsistencyChecker.
+
+    When a check is needed and its result is not known, the algorithm runs a lookahead that
+    `speculate`s on the checks it may need next (this one first), up to `max_lookahead`
+    new checks. Results are memoized for the lifetime of the object, so a check is never
+    evaluated twice.
+    """
+
+    def __init__(self, checker: ConsistencyChecker,
+                 processes: Optional[int] = None,
+                 max_lookahead: Optional[int] = None) -> None:
+        self.checker = checker
+        self.processes = processes or os.cpu_count() or 1
+        self.max_lookahead = max_lookahead or self.processes
+        # consistency checks (C, Δ) -> their results
+        self.cache: Dict[Tuple[FrozenSet[int], FrozenSet[int]], 'Future[bool]'] = {}
+        self._budget = 0  # checks the current lookahead can still submit
+        self._visits = 0  # calls the current lookahead can still explore
+
+    def is_consistent(self, set_c: List[int], delta: List[int],
+                      lookahead: Callable[[], None]) -> bool:
+        """
+        Return the result of the check, running the lookahead first if it is not known.
+        :param lookahead: speculates on the checks from this one (which it submits first)
+        """
+        key = (frozenset(set_c), frozenset(delta))
+        if key not in self.cache:
+            self._budget = self.max_lookahead
+            self._visits = 16 * self.max_lookahead
+            lookahead()
+            if key not in self.cache:
+                self.speculate(set_c, delta)
+        return self.cache[key].result()
+
+    def visit(self) -> bool:
+        """Return whether the lookahead can explore one more call."""
+        if self._budget <= 0 or self._visits <= 0:
+            return False
+        self._visits -= 1
+        return True
+
+    def speculate(self, set_c: List[int], delta: List[int]) -> Optional[bool]:
+        """Submit the check if it is new, and return its result if it is already known."""
+        key = (frozenset(set_c), frozenset(delta))
+        future = self.cache.get(key)
+        if future is None:
+            logging.debug('submit [C=%s, Δ=%s]', set_c, delta)
+            future = self.checker.submit(set_c, delta, self.processes)
+            self.cache[key] = future
+            self._budget -= 1
+        if future.done() and future.exception() is None:
+            return future.result()
+        return None
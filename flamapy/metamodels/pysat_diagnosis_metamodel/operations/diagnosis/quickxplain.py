@@ -35,11 +35,23 @@ class QuickXPlain:
         # print(f'quickXPlain [C={C}, B={B}]')
 
         # if C is empty or consistent(B U C) then return empty set
-        if len(set_c) == 0 or self.checker.is_consistent(set_b + set_c, []):
+        if len(set_c) == 0:
+            logging.debug('return Φ')
+            return []
+        consistent, core = self.checker.check(set_b + set_c, [])
+        if consistent:
             logging.debug('return Φ')
             # print('return Φ')
             return []
 
+        # the conflict lies in the shortest suffix of C inconsistent with B, which contains
+        # the unsat core: the constraints before the first one of the core are left out
+        constraints = set(core)
+        if constraints.issubset(set(set_b).union(set_c)):
+            first = next((position for position, item in enumerate(set_c)
+                          if item in constraints), 0)
+            set_c = set_c[first:]
+
         # return QX(Φ, C, B)
         set_cs = self._qx([], set_c, set_b)
 
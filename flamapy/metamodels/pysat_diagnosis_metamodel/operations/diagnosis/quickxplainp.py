@@ -0,0 +1,84 @@
+import logging
+from typing import List, Optional
+
+from .checker import ConsistencyChecker
+from .lookahead import Continuation, LookaheadChecks, done
+from .quickxplain import QuickXPlain
+from .utils import split
+
+
+class QuickXPlainP(QuickXPlain):
+    """
+    Parallelized QuickXPlain: QuickXPlain whose consistency checks are evaluated ahead of
+    time in the worker processes of the checker.
+
+    Before waiting for a consistency check that is not available yet, a lookahead explores
+    the checks QX may need next, assuming each pending check to be consistent and then
+    inconsistent, and submits up to `max_lookahead` of them. The recursion itself is the
+    one of QuickXPlain, so it returns exactly the same minimal conflict.
+    """
+
+    def __init__(self, checker: ConsistencyChecker,
+                 processes: Optional[int] = None,
+                 max_lookahead: Optional[int] = None) -> None:
+        super().__init__(checker)
+        self.checks = LookaheadChecks(checker, processes, max_lookahead)
+
+    def _qx(self, set_d: List[int], set_c: List[int], set_b: List[int],
+            then: Continuation = done) -> List[int]:
+        """
+        The QX function of QuickXPlain, where every consistency check is taken from the cache.
+        :param then: the rest of the computation after this call, for the lookahead
+        """
+        logging.debug('>>> QX [D=%s, C=%s, B=%s]', set_d, set_c, set_b)
+
+        # if D != Φ and inconsistent(B) then return Φ
+        if len(set_d) != 0 and not self.checks.is_consistent(
+                set_b, set_c, lambda: self._lookahead(set_d, set_c, set_b, then)):
+            logging.debug('<<< return Φ')
+            return []
+
+        # if C is singleton then return C
+        if len(set_c) == 1:
+            logging.debug('<<< return %s', set_c)
+            return set_c
+
+        # C1 = {c1..ck}; C2 = {ck+1..cn};
+        set_c1, set_c2 = split(set_c)
+
+        # CS1 = QX(C2, C1, B U C2)
+        cs1 = self._qx(set_c2, set_c1, (set_b + set_c2),
+                       lambda cs1: self._lookahead(cs1, set_c2, set_b + cs1,
+                                                   lambda cs2: then(cs1 + cs2)))
+        # CS2 = QX(CS1, C2, B U CS1)
+        cs2 = self._qx(cs1, set_c2, (set_b + cs1), lambda cs2: then(cs1 + cs2))
+
+        logging.debug('<<< return %s', (cs1 + cs2))
+
+        # return CS1 U CS2
+        return cs1 + cs2
+
+    def _lookahead(self, set_d: List[int], set_c: List[int], set_b: List[int],
+                   then: Continuation) -> None:
+        """
+        Submit the consistency checks of QX(D, C, B) followed by `then`, for both outcomes
+        of the checks whose result is not known yet.
+        """
+        if not self.checks.visit():
+            return
+
+        if len(set_d) != 0:
+            consistent = self.checks.speculate(set_b, set_c)
+            if consistent is not True:
+                then([])
+            if consistent is False:
+                return
+
+        if len(set_c) == 1:
+            then(set_c)
+            return
+
+        set_c1, set_c2 = split(set_c)
+        self._lookahead(set_c2, set_c1, set_b + set_c2,
+                        lambda cs1: self._lookahead(cs1, set_c2, set_b + cs1,
+                                                    lambda cs2: then(cs1 + cs2)))
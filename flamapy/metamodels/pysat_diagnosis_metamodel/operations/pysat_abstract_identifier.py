@@ -4,9 +4,15 @@ from typing import cast, List, Tuple
 from flamapy.core.models import VariabilityModel
 from flamapy.core.operations import Operation
 from flamapy.metamodels.configuration_metamodel.models import Configuration
+from flamapy.metamodels.pysat_metamodel.models.pysat_session import (
+    DEFAULT_SOLVER,
+    check_solver_name
+)
 
 from .diagnosis.checker import ConsistencyChecker
 from .diagnosis.hsdag.hsdag import HSDAG
+from .diagnosis.hsdag.labeler.labeler import IHSLabelable
+from .diagnosis.hsdag.parallel_hsdag import ParallelHSDAG
 from ..models.pysat_diagnosis_model import DiagnosisModel
 
 
@@ -42,21 +48,31 @@ class PySATAbstractIdentifier(Operation):
     - configuration - a configuration to be diagnosed
     - test_case - a test case to be used for diagnosis
     - max_depth - specify the maximum depth of the HSDAG to be computed
+    - solver_name - the PySAT backend of the consistency checks (glucose3 by default)
+    - hsdag_processes - the number of worker processes labeling the nodes of each level of
+      the HSDAG (1, the default, labels them sequentially)
     """
 
     def __init__(self) -> None:
         self.result = False
         self.configuration = None
         self.test_case = None
-        self.solver_name = 'glucose3'
+        self.solver_name = DEFAULT_SOLVER
         self.result_messages: List[str] = []
 
         self.checker = None
         self.max_depth = 0  # 0 means no limit
+        self.hsdag_processes = 1
 
     def set_max_depth(self, max_depth: int) -> None:
         self.max_depth = max_depth
 
+    def set_hsdag_processes(self, processes: int) -> None:
+        self.hsdag_processes = processes
+
+    def set_solver_name(self, solver_name: str) -> None:
+        self.solver_name = check_solver_name(solver_name)
+
     def set_configuration(self, configuration: Configuration) -> None:
         self.configuration = configuration
 
@@ -77,6 +93,16 @@ class PySATAbstractIdentifier(Operation):
         checker.delete()
         return self
 
+    def create_hsdag(self, labeler: IHSLabelable, checker: ConsistencyChecker,
+                     sequential_labeler: IHSLabelable) -> HSDAG:
+        """
+        Creates the HSDAG of the labeler: a ParallelHSDAG if hsdag_processes > 1, whose
+        workers use the sequential labeler (they cannot start worker pools of their own).
+        """
+        if self.hsdag_processes > 1:
+            return ParallelHSDAG(labeler, checker, self.hsdag_processes, sequential_labeler)
+        return HSDAG(labeler)
+
     @abstractmethod
     def prepare_hsdag(self, model: DiagnosisModel) -> Tuple[ConsistencyChecker, HSDAG]:
         pass
@@ -4,7 +4,11 @@ from flamapy.metamodels.pysat_diagnosis_metamodel.models import DiagnosisModel
 from . import PySATAbstractIdentifier
 from .diagnosis.checker import ConsistencyChecker
 from .diagnosis.hsdag.hsdag import HSDAG
-from .diagnosis.hsdag.labeler.quickxplain_labeler import QuickXPlainParameters, QuickXPlainLabeler
+from .diagnosis.hsdag.labeler.quickxplain_labeler import (
+    QuickXPlainParameters,
+    QuickXPlainLabeler,
+    QuickXPlainPLabeler
+)
 
 
 class PySATConflict(PySATAbstractIdentifier):
@@ -16,15 +20,21 @@ class PySATConflict(PySATAbstractIdentifier):
     - test_case - a test case to be used for diagnosis
     - max_conflicts - specify the maximum number of conflicts to be computed
     - max_depth - specify the maximum depth of the HSDAG to be computed
+    - processes - the number of worker processes of QuickXPlainP (1, the default, runs
+      QuickXPlain)
     """
 
     def __init__(self) -> None:
         super().__init__()
         self.max_conflicts = -1  # -1 means no limit
+        self.processes = 1
 
     def set_max_conflicts(self, max_conflicts: int) -> None:
         self.max_conflicts = max_conflicts
 
+    def set_processes(self, processes: int) -> None:
+        self.processes = processes
+
     def prepare_hsdag(self, model: DiagnosisModel) -> Tuple[ConsistencyChecker, HSDAG]:
         # transform model to diagnosis model
         model.prepare_diagnosis_task(configuration=self.configuration, test_case=self.test_case)
@@ -39,9 +49,12 @@ class PySATConflict(PySATAbstractIdentifier):
 
         checker = ConsistencyChecker(self.solver_name, model.get_kb())
         parameters = QuickXPlainParameters(set_c, [], model.get_b())
-        labeler = QuickXPlainLabeler(checker, parameters)
+        sequential_labeler = QuickXPlainLabeler(checker, parameters)
+        labeler = sequential_labeler
+        if self.processes > 1:
+            labeler = QuickXPlainPLabeler(checker, parameters, self.processes)
 
-        hsdag = HSDAG(labeler)
+        hsdag = self.create_hsdag(labeler, checker, sequential_labeler)
         hsdag.max_number_conflicts = self.max_conflicts
         hsdag.max_depth = self.max_depth
 
@@ -4,7 +4,11 @@ from flamapy.metamodels.pysat_diagnosis_metamodel.models import DiagnosisModel
 from . import PySATAbstractIdentifier
 from .diagnosis.checker import ConsistencyChecker
 from .diagnosis.hsdag.hsdag import HSDAG
-from .diagnosis.hsdag.labeler.fastdiag_labeler import FastDiagParameters, FastDiagLabeler
+from .diagnosis.hsdag.labeler.fastdiag_labeler import (
+    FastDiagParameters,
+    FastDiagLabeler,
+    FastDiagPLabeler
+)
 
 
 class PySATDiagnosis(PySATAbstractIdentifier):
@@ -16,15 +20,20 @@ class PySATDiagnosis(PySATAbstractIdentifier):
     - test_case - a test case to be used for diagnosis
     - max_diagnoses - specify the maximum number of diagnoses to be computed
     - max_depth - specify the maximum depth of the HSDAG to be computed
+    - processes - the number of worker processes of FastDiagP (1, the default, runs FastDiag)
     """
 
     def __init__(self) -> None:
         super().__init__()
         self.max_diagnoses = -1  # -1 means no limit
+        self.processes = 1
 
     def set_max_diagnoses(self, max_diagnoses: int) -> None:
         self.max_diagnoses = max_diagnoses
 
+    def set_processes(self, processes: int) -> None:
+        self.processes = processes
+
     def prepare_hsdag(self, model: DiagnosisModel) -> Tuple[ConsistencyChecker, HSDAG]:
         # transform model to diagnosis model
         model.prepare_diagnosis_task(configuration=self.configuration, test_case=self.test_case)
@@ -33,9 +42,12 @@ class PySATDiagnosis(PySATAbstractIdentifier):
 
         checker = ConsistencyChecker(self.solver_name, model.get_kb())
         parameters = FastDiagParameters(set_c, [], model.get_b())
-        labeler = FastDiagLabeler(checker, parameters)
+        sequential_labeler = FastDiagLabeler(checker, parameters)
+        labeler = sequential_labeler
+        if self.processes > 1:
+            labeler = FastDiagPLabeler(checker, parameters, self.processes)
 
-        hsdag = HSDAG(labeler)
+        hsdag = self.create_hsdag(labeler, checker, sequential_labeler)
         hsdag.max_number_diagnoses = self.max_diagnoses
         hsdag.max_depth = self.max_depth
 
@@ -8,6 +8,10 @@ from flamapy.metamodels.fm_metamodel.models.feature_model import (
 )
 
 from flamapy.metamodels.pysat_metamodel.transformations.fm_to_pysat import FmToPysat
+from flamapy.metamodels.pysat_metamodel.transformations.cardinality_encodings import (
+    AtMostOneEncoding,
+    CardinalityEncoding,
+)
 from ..models.pysat_diagnosis_model import DiagnosisModel
 
 
@@ -20,8 +24,12 @@ class FmToDiagPysat(FmToPysat):
     def get_destination_extension() -> str:
         return 'pysat_diagnosis'
 
-    def __init__(self, source_model: FeatureModel) -> None:
-        super().__init__(source_model)
+    def __init__(self,
+                 source_model: FeatureModel,
+                 cardinality_encoding: CardinalityEncoding = CardinalityEncoding.SEQUENTIAL_COUNTER,
+                 alternative_encoding: AtMostOneEncoding = AtMostOneEncoding.LADDER
+                 ) -> None:
+        super().__init__(source_model, cardinality_encoding, alternative_encoding)
         self.destination_model = DiagnosisModel()
 
     def add_root(self, feature: Feature) -> None:
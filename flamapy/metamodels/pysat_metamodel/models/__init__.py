@@ -1,6 +1,10 @@
 # pylint: disable=cyclic-import
 
 from .pysat_model import PySATModel
+from .pysat_analysis_cache import PySATAnalysisCache
+from .pysat_clauses import PySATClauses
+from .pysat_ddnnf import PySATDDNNF
+from .pysat_session import PySATSession
 from .txtcnf_model import (
     TextCNFModel,
     CNFLogicConnective,
@@ -10,6 +14,10 @@ from .txtcnf_model import (
 
 __all__ = [
     'PySATModel',
+    'PySATAnalysisCache',
+    'PySATClauses',
+    'PySATDDNNF',
+    'PySATSession',
     'TextCNFModel',
     'CNFLogicConnective',
     'TextCNFNotation'
@@ -0,0 +1,38 @@
+from typing import Any, Callable, Hashable, TypeVar, cast
+
+
+T = TypeVar('T')
+
+
+class PySATAnalysisCache:
+    """Results of the analyses already run on a PySATModel (satisfiability, backbone,
+    counts, enumerations...), so that metrics and operations run on the same model do not
+    recompute them.
+
+    Entries are keyed by the name of the analysis (and its parameters, if any). The model
+    drops its cache when its clauses or features change, see `PySATModel.get_analysis_cache`.
+    Cached values are shared: callers must copy mutable values before modifying them.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the result stored for `key`, computing and storing it on the first call."""
+        if key in self._results:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._results[key] = compute()
+        return cast(T, self._results[key])
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self) -> None:
+        self._results.clear()
@@ -0,0 +1,96 @@
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, overload
+
+from pysat.formula import CNF
+from pysat.solvers import Solver
+
+
+class PySATClauses(Sequence[list[int]]):
+    """Compact clause store.
+
+    The literals of all the clauses are kept in one flat array of C ints, and clause i spans
+    literals[offsets[i]:offsets[i + 1]]. It behaves as a read-only sequence of clauses (lists
+    of ints) and, like pysat's CNF, it exposes `clauses` and `nv`, so it can be used wherever
+    a CNF was read. Clauses are only boxed as Python lists when they are accessed.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]] = ()) -> None:
+        self.literals = array('i')
+        self.offsets = array('q', [0])
+        self.nv = 0  # pylint: disable=invalid-name
+        self.extend(clauses)
+
+    @property
+    def clauses(self) -> 'PySATClauses':
+        return self
+
+    def append(self, clause: Iterable[int]) -> None:
+        self.literals.extend(clause)
+        start = self.offsets[-1]
+        self.offsets.append(len(self.literals))
+        if start < len(self.literals):
+            self.nv = max(self.nv, max(map(abs, self.literals[start:])))
+
+    def extend(self, clauses: Iterable[Iterable[int]]) -> None:
+        start = len(self.literals)
+        for clause in clauses:
+            self.literals.extend(clause)
+            self.offsets.append(len(self.literals))
+        if start < len(self.literals):
+            self.nv = max(self.nv, max(map(abs, self.literals[start:])))
+
+    def extend_flat(self, literals: 'array[int]', ends: Iterable[int]) -> None:
+        """Append clauses given as one flat run of literals (without terminating zeros) and
+        the end position of each clause within that run."""
+        base = len(self.literals)
+        self.literals.extend(literals)
+        self.offsets.extend(map(base.__add__, ends))
+        if literals:
+            self.nv = max(self.nv, max(literals), -min(literals))
+
+    def load_into(self, solver: Solver, start: int = 0) -> None:
+        """Add the clauses from index `start` onwards to the solver, without boxing them."""
+        literals, offsets = self.literals, self.offsets
+        for index in range(start, len(self)):
+            solver.add_clause(literals[offsets[index]:offsets[index + 1]])
+
+    def to_cnf(self) -> CNF:
+        return CNF(from_clauses=list(self))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> list[int]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'PySATClauses':
+        ...
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return PySATClauses(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('clause index out of range')
+        return self.literals[self.offsets[index]:self.offsets[index + 1]].tolist()
+
+    def __iter__(self) -> Iterator[list[int]]:
+        literals, offsets = self.literals, self.offsets
+        for index in range(len(self)):
+            yield literals[offsets[index]:offsets[index + 1]].tolist()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PySATClauses):
+            return self.literals == other.literals and self.offsets == other.offsets
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self)})'
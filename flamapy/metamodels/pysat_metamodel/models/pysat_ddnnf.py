@@ -0,0 +1,311 @@
+"""
+Knowledge compilation of a CNF formula into a smooth decision-DNNF.
+
+The compiler is an exhaustive DPLL search with unit propagation, connected-component
+decomposition and component caching; its trace is recorded as a circuit whose OR nodes
+are deterministic (their children disagree on the branching variable) and whose AND
+nodes are decomposable (their children share no variable). Once compiled, model
+counting, conditioning and literal counts are linear in the size of the circuit.
+"""
+from typing import Generator, Iterable, Optional
+
+
+Clause = tuple[int, ...]
+# A step of the compilation: it yields the steps whose nodes it needs and returns its node
+_Step = Generator['_Step', int, int]
+
+_FALSE = 0
+_TRUE = 1
+_LITERAL = 2
+_AND = 3
+_OR = 4
+
+
+class PySATDDNNF:
+    """A smooth deterministic decomposable negation normal form circuit.
+
+    Nodes are stored in topological order (children always precede their parents) and the
+    last node is the root. Every variable from 1 to `n_variables` is mentioned by the
+    circuit, so counts are computed over the same variables the solver enumerates.
+    """
+
+    def __init__(self, n_variables: int) -> None:
+        self.n_variables = n_variables
+        self.kinds: list[int] = []
+        self.literals: list[int] = []  # literal of a _LITERAL node, 0 otherwise
+        self.children: list[tuple[int, ...]] = []
+        self._unique: dict[tuple[int, int, tuple[int, ...]], int] = {}
+
+    @property
+    def root(self) -> int:
+        return len(self.kinds) - 1
+
+    def size(self) -> int:
+        return len(self.kinds)
+
+    def count(self, assumptions: Optional[Iterable[int]] = None) -> int:
+        """Return the number of models that satisfy the given assumptions."""
+        return self.values(assumptions)[self.root]
+
+    def values(self, assumptions: Optional[Iterable[int]] = None) -> list[int]:
+        """Return the number of models of every node conditioned on the assumptions."""
+        fixed = set(assumptions or [])
+        values: list[int] = []
+        for kind, literal, children in zip(self.kinds, self.literals, self.children):
+            if kind == _LITERAL:
+                values.append(0 if -literal in fixed else 1)
+            elif kind == _AND:
+                value = 1
+                for child in children:
+                    value *= values[child]
+                    if value == 0:
+                        break
+                values.append(value)
+            elif kind == _OR:
+                values.append(sum(values[child] for child in children))
+            else:
+                values.append(kind)  # _FALSE is 0 and _TRUE is 1
+        return values
+
+    def literal_counts(self, assumptions: Optional[Iterable[int]] = None) -> dict[int, int]:
+        """Return, for every literal, the number of models (under the assumptions) in which
+        it holds.
+
+        It is computed with one bottom-up and one top-down (derivative) traversal, so the
+        counts of all literals cost the same as two model counts.
+        """
+        values = self.values(assumptions)
+        derivatives = [0] * len(values)
+        derivatives[self.root] = 1
+        counts = {lit: 0 for var in range(1, self.n_variables + 1) for lit in (var, -var)}
+        for node in range(self.root, -1, -1):
+            derivative = derivatives[node]
+            if derivative == 0:
+                continue
+            kind = self.kinds[node]
+            children = self.children[node]
+            if kind == _LITERAL:
+                counts[self.literals[node]] += derivative * values[node]
+            elif kind == _OR:
+                for child in children:
+                    derivatives[child] += derivative
+            elif kind == _AND:
+                # product of the siblings of each child, without divisions
+                prefix = [1]
+                for child in children[:-1]:
+                    prefix.append(prefix[-1] * values[child])
+                suffix = 1
+                for index in range(len(children) - 1, -1, -1):
+                    derivatives[children[index]] += derivative * prefix[index] * suffix
+                    suffix *= values[children[index]]
+        return counts
+
+    def unrank(self, rank: int, values: list[int]) -> list[int]:
+        """Return the model with the given rank (0 <= rank < values[root]) among the models
+        counted by `values`, as returned by `values(assumptions)`.
+
+        OR nodes split the ranks among their children in order, and AND nodes decompose
+        them in mixed radix, so a uniformly drawn rank gives a uniformly drawn model.
+        """
+        model = []
+        stack = [(self.root, rank)]
+        while stack:
+            node, rank = stack.pop()
+            kind = self.kinds[node]
+            if kind == _LITERAL:
+                model.append(self.literals[node])
+            elif kind == _OR:
+                for child in self.children[node]:
+                    if rank < values[child]:
+                        stack.append((child, rank))
+                        break
+                    rank -= values[child]
+            elif kind == _AND:
+                for child in self.children[node]:
+                    rank, child_rank = divmod(rank, values[child])
+                    stack.append((child, child_rank))
+        return sorted(model, key=abs)
+
+    def add_node(self, kind: int, literal: int = 0, children: tuple[int, ...] = ()) -> int:
+        key = (kind, literal, children)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self.kinds)
+            self.kinds.append(kind)
+            self.literals.append(literal)
+            self.children.append(children)
+            self._unique[key] = node
+        return node
+
+
+def compile_ddnnf(clauses: Iterable[Iterable[int]],
+                  n_variables: int,
+                  decision_variables: Optional[Iterable[int]] = None) -> PySATDDNNF:
+    """Compile a CNF formula over the variables 1..n_variables into a smooth d-DNNF.
+
+    :param decision_variables: variables to branch on first (usually the features). Unit
+        propagation then fixes the auxiliary variables of the encodings, which keeps the
+        search and the circuit small.
+    """
+    return _Compiler(n_variables, decision_variables).compile(clauses)
+
+
+class _Compiler:
+
+    def __init__(self, n_variables: int, decision_variables: Optional[Iterable[int]]) -> None:
+        self.circuit = PySATDDNNF(n_variables)
+        self.decision_variables = frozenset(decision_variables or [])
+        self.false = self.circuit.add_node(_FALSE)
+        self.true = self.circuit.add_node(_TRUE)
+        self.cache: dict[frozenset[Clause], int] = {}
+
+    def compile(self, clauses: Iterable[Iterable[int]]) -> PySATDDNNF:
+        normalized = set()
+        for clause in clauses:
+            literals = set(clause)
+            if any(-lit in literals for lit in literals):
+                continue  # tautology
+            normalized.add(tuple(sorted(literals)))
+        if () in normalized:
+            root = self.false  # an empty clause: no model
+        else:
+            scope = frozenset(range(1, self.circuit.n_variables + 1))
+            root = self._run(self._decompose(list(normalized), scope))
+        # make sure the root is the last node
+        self.circuit.add_node(_AND, children=(root,))
+        return self.circuit
+
+    @staticmethod
+    def _run(step: _Step) -> int:
+        """Run a step and the steps it needs with an explicit stack (the search is as deep
+        as the number of decisions, which can exceed the recursion limit)."""
+        stack = [step]
+        node: Optional[int] = None
+        while stack:
+            try:
+                # a step starts with None and resumes with the node of the step it yielded
+                stack.append(stack[-1].send(node))  # type: ignore[arg-type]
+                node = None
+            except StopIteration as finished:
+                stack.pop()
+                node = finished.value
+        assert node is not None
+        return node
+
+    def _decompose(self, clauses: list[Clause], scope: frozenset[int]) -> _Step:
+        """Return a node over exactly the variables of `scope` equivalent to `clauses`."""
+        propagated = _propagate(clauses)
+        if propagated is None:
+            return self.false
+        implied, clauses = propagated
+
+        children = [self.circuit.add_node(_LITERAL, lit) for lit in sorted(implied, key=abs)]
+        components = _components(clauses)
+        mentioned = {abs(lit) for lit in implied}
+        for component, variables in components:
+            node = yield self._compile_component(component, variables)
+            if node == self.false:
+                return self.false
+            children.append(node)
+            mentioned.update(variables)
+        for var in sorted(scope - mentioned):
+            children.append(self._free(var))
+
+        if not children:
+            return self.true
+        if len(children) == 1:
+            return children[0]
+        return self.circuit.add_node(_AND, children=tuple(children))
+
+    def _compile_component(self, clauses: list[Clause], variables: frozenset[int]) -> _Step:
+        key = frozenset(clauses)
+        node = self.cache.get(key)
+        if node is not None:
+            return node
+
+        var = self._select_variable(clauses, variables)
+
+        positive = yield self._decompose(clauses + [(var,)], variables)
+        negative = yield self._decompose(clauses + [(-var,)], variables)
+        if positive == self.false:
+            node = negative
+        elif negative == self.false:
+            node = positive
+        else:
+            node = self.circuit.add_node(_OR, children=(positive, negative))
+        self.cache[key] = node
+        return node
+
+    def _select_variable(self, clauses: list[Clause], variables: frozenset[int]) -> int:
+        # Decision variables are taken in their static order: it follows the feature tree
+        # and the order of the counters built by the cardinality encodings, so residual
+        # components repeat and hit the cache. Otherwise, the most frequent variable.
+        decisions = variables & self.decision_variables
+        if decisions:
+            return min(decisions)
+        occurrences: dict[int, int] = {}
+        for clause in clauses:
+            for lit in clause:
+                occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+        return max(sorted(occurrences), key=occurrences.__getitem__)
+
+    def _free(self, var: int) -> int:
+        positive = self.circuit.add_node(_LITERAL, var)
+        negative = self.circuit.add_node(_LITERAL, -var)
+        return self.circuit.add_node(_OR, children=(positive, negative))
+
+
+def _propagate(clauses: list[Clause]) -> Optional[tuple[set[int], list[Clause]]]:
+    """Apply unit propagation. Return the implied literals and the simplified clauses,
+    or None if a conflict is found."""
+    implied: set[int] = set()
+    units = [clause[0] for clause in clauses if len(clause) == 1]
+    while units:
+        unit = units.pop()
+        if -unit in implied:
+            return None
+        if unit in implied:
+            continue
+        implied.add(unit)
+        simplified = []
+        for clause in clauses:
+            if unit in clause:
+                continue
+            if -unit in clause:
+                clause = tuple(lit for lit in clause if lit != -unit)
+                if not clause:
+                    return None
+                if len(clause) == 1:
+                    units.append(clause[0])
+            simplified.append(clause)
+        clauses = simplified
+    return implied, clauses
+
+
+def _components(clauses: list[Clause]) -> list[tuple[list[Clause], frozenset[int]]]:
+    """Split the clauses into groups that share no variable."""
+    parent: dict[int, int] = {}
+
+    def find(var: int) -> int:
+        root = var
+        while parent[root] != root:
+            root = parent[root]
+        while parent[var] != root:
+            parent[var], var = root, parent[var]
+        return root
+
+    for clause in clauses:
+        first = abs(clause[0])
+        parent.setdefault(first, first)
+        for lit in clause[1:]:
+            var = abs(lit)
+            parent.setdefault(var, var)
+            root_a, root_b = find(first), find(var)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+    groups: dict[int, list[Clause]] = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return [(group, frozenset(abs(lit) for clause in group for lit in clause))
+            for group in groups.values()]
@@ -1,7 +1,13 @@
-from pysat.formula import CNF
+from typing import Any, Iterable, Optional
 
 from flamapy.core.exceptions import FlamaException
 from flamapy.core.models import VariabilityModel
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+from .pysat_analysis_cache import PySATAnalysisCache
+from .pysat_clauses import PySATClauses
+from .pysat_ddnnf import PySATDDNNF, compile_ddnnf
+from .pysat_session import DEFAULT_SOLVER, PySATSession, check_solver_name
 
 
 class PySATModel(VariabilityModel):
@@ -10,18 +16,113 @@ class PySATModel(VariabilityModel):
         return 'pysat'
 
     def __init__(self) -> None:
-        self._cnf = CNF()
+        self._cnf = PySATClauses()
         self.variables: dict[str, int] = {}  # feature's name -> id
         self.features: dict[int, str] = {}  # id -> feature's name
         self.original_model: VariabilityModel
+        self.solver_name = DEFAULT_SOLVER  # PySAT backend of the session
+        self._session: Optional[PySATSession] = None
+        self._ddnnf: Optional[PySATDDNNF] = None
+        self._ddnnf_clauses = 0  # number of clauses compiled into the d-DNNF
+        # translation of configurations: name -> (variable, position in variables),
+        # the literals of the empty full configuration, and the variables map they index
+        self._literal_index: dict[str, tuple[int, int]] = {}
+        self._deselected: list[int] = []
+        self._indexed: tuple[int, int] = (0, 0)
+        self._analysis_cache = PySATAnalysisCache()
+        self._analysed: tuple[int, int, int, int] = (0, 0, 0, 0)  # state of the analysed model
 
     def add_clause(self, clause: list[int]) -> None:
         self._cnf.append(clause)
 
+    def add_clauses(self, clauses: Iterable[Iterable[int]]) -> None:
+        self._cnf.extend(clauses)
+
     def get_variable(self, key: str) -> int:
         if key not in self.variables:
             raise FlamaException(f'Feature {key} not found')
         return self.variables[key]
 
-    def get_all_clauses(self) -> CNF:
+    def configuration_to_assumptions(self,
+                                     configuration: Configuration,
+                                     is_full: bool = False) -> tuple[list[int], list[Any]]:
+        """Translate a configuration (keyed by feature names or Features) into literals.
+
+        Return the literals and the keys of the configuration that are not features of the
+        model. In a full configuration, the features not selected in it are deselected, and
+        the literals follow the order of `variables`.
+        """
+        index = self._get_literal_index()
+        missing = []
+        if is_full:
+            literals = self._deselected.copy()
+            for key, selected in configuration.elements.items():
+                entry = index.get(key if isinstance(key, str) else key.name)
+                if entry is None:
+                    missing.append(key)
+                elif selected:
+                    literals[entry[1]] = entry[0]
+            return literals, missing
+        literals = []
+        for key, selected in configuration.elements.items():
+            entry = index.get(key if isinstance(key, str) else key.name)
+            if entry is None:
+                missing.append(key)
+            else:
+                literals.append(entry[0] if selected else -entry[0])
+        return literals, missing
+
+    def _get_literal_index(self) -> dict[str, tuple[int, int]]:
+        # rebuilt if `variables` was replaced or has grown since it was indexed
+        if self._indexed != (id(self.variables), len(self.variables)):
+            self._literal_index = {name: (variable, position) for position, (name, variable)
+                                   in enumerate(self.variables.items())}
+            self._deselected = [-variable for variable in self.variables.values()]
+            self._indexed = (id(self.variables), len(self.variables))
+        return self._literal_index
+
+    def get_all_clauses(self) -> PySATClauses:
+        """Return the clauses of the model (use `to_cnf()` on them for a pysat CNF)."""
         return self._cnf
+
+    def get_session(self) -> PySATSession:
+        """Return the incremental solver session shared by the operations on this model.
+
+        The session is created lazily and loads the clauses only once.
+        """
+        if self._session is None:
+            self._session = PySATSession(self._cnf, self.solver_name)
+        return self._session
+
+    def set_solver_name(self, solver_name: str) -> None:
+        """Select the PySAT backend used by the operations on this model (e.g., 'cadical153',
+        'glucose4', 'maplechrono'). The backend must support assumptions.
+
+        The current session, if any, is released and a new one is created on next use.
+        """
+        self.solver_name = check_solver_name(solver_name)
+        if self._session is not None and self._session.solver_name != solver_name:
+            self._session.delete()
+            self._session = None
+
+    def get_ddnnf(self) -> PySATDDNNF:
+        """Return the d-DNNF compilation of the clauses, used for counting without enumerating.
+
+        The compilation is cached and redone only if clauses were added since.
+        """
+        if self._ddnnf is None or self._ddnnf_clauses != len(self._cnf):
+            self._ddnnf = compile_ddnnf(self._cnf, self._cnf.nv, self.features.keys())
+            self._ddnnf_clauses = len(self._cnf)
+        return self._ddnnf
+
+    def get_analysis_cache(self) -> PySATAnalysisCache:
+        """Return the results of the analyses run on this model.
+
+        The cache is emptied if clauses were added or the features were changed since the
+        results were stored.
+        """
+        state = (len(self._cnf), id(self.variables), len(self.variables), id(self.features))
+        if self._analysed != state:
+            self._analysis_cache.clear()
+            self._analysed = state
+        return self._analysis_cache
@@ -0,0 +1,97 @@
+from typing import Iterator, Optional
+
+from pysat.solvers import Solver, SolverNames
+
+from flamapy.core.exceptions import FlamaException
+
+from .pysat_clauses import PySATClauses
+
+
+DEFAULT_SOLVER = 'glucose3'
+
+
+def check_solver_name(solver_name: str) -> str:
+    """Return the name if it is a PySAT backend (e.g., 'glucose3', 'cadical153', 'g4')."""
+    if not any(solver_name in names for backend, names in vars(SolverNames).items()
+               if not backend.startswith('_')):
+        raise FlamaException(f'Unknown SAT solver {solver_name}.')
+    return solver_name
+
+
+class PySATSession:
+    """Incremental solver bound to the CNF of a PySATModel.
+
+    The underlying solver is created on first use and loads the formula once.
+    Clauses appended to the formula afterwards are pushed on the next query, so
+    the session never needs to be rebuilt. Queries are answered through
+    assumptions only, which keeps the clauses learned by the solver available to
+    every operation run on the same model.
+    """
+
+    def __init__(self, cnf: PySATClauses, solver_name: str = DEFAULT_SOLVER) -> None:
+        self.solver_name = check_solver_name(solver_name)
+        self._cnf = cnf
+        self._solver: Optional[Solver] = None
+        self._loaded_clauses = 0  # number of clauses of the CNF already in the solver
+
+    @property
+    def solver(self) -> Solver:
+        """Return the solver, loading any clause not yet pushed to it."""
+        if self._solver is None:
+            self._solver = Solver(name=self.solver_name)
+        if self._loaded_clauses < len(self._cnf):
+            self._cnf.load_into(self._solver, self._loaded_clauses)
+            self._loaded_clauses = len(self._cnf)
+        return self._solver
+
+    def solve(self, assumptions: Optional[list[int]] = None) -> bool:
+        return bool(self.solver.solve(assumptions=assumptions or []))
+
+    def propagate(self, assumptions: Optional[list[int]] = None) -> Optional[list[int]]:
+        """Return the literals implied by unit propagation of the assumptions, or None if
+        propagation finds a conflict. It is much cheaper than `solve`."""
+        status, literals = self.solver.propagate(assumptions=assumptions or [])
+        return literals if status else None
+
+    def get_model(self) -> list[int]:
+        """Return the assignment of the formula variables found by the last `solve`."""
+        model = self.solver.get_model()
+        if model is None:
+            return []
+        return model[:self._cnf.nv]
+
+    def get_core(self) -> list[int]:
+        """Return the failed assumptions of the last unsuccessful `solve`."""
+        core = self.solver.get_core()
+        return [] if core is None else core
+
+    def enum_models(self,
+                    assumptions: Optional[list[int]] = None,
+                    projection: Optional[list[int]] = None) -> Iterator[list[int]]:
+        """Enumerate the models of the formula under the given assumptions.
+
+        If `projection` is given, only the assignments of those variables are yielded and
+        each distinct projected assignment is yielded once (blocking clauses are built on
+        the projected variables only).
+
+        Enumeration adds blocking clauses and biases the solver's phases, so it runs on a
+        scratch solver loaded in bulk with the same formula. This keeps the shared
+        solver clean and makes the enumeration order independent of previous queries.
+        Models are produced lazily: closing the generator stops the enumeration.
+        """
+        with Solver(name=self.solver_name) as solver:
+            self._cnf.load_into(solver)
+            while solver.solve(assumptions=assumptions or []):
+                model = solver.get_model()
+                if projection is not None:
+                    assigned = set(model)
+                    model = [var if var in assigned else -var for var in projection]
+                yield model
+                solver.add_clause([-lit for lit in model])
+
+    def delete(self) -> None:
+        """Release the underlying solver. The session can still be used afterwards."""
+        if self._solver is not None:
+            self._solver.delete()
+            self._solver = None
+            self._loaded_clauses = 0
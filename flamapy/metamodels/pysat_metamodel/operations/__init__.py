@@ -1,5 +1,8 @@
 from .pysat_satisfiable import PySATSatisfiable
-from .pysat_satisfiable_configuration import PySATSatisfiableConfiguration
+from .pysat_satisfiable_configuration import (
+    PySATSatisfiableConfiguration,
+    PySATSatisfiableConfigurationBatch,
+)
 from .pysat_configurations import PySATConfigurations
 from .pysat_configurations_number import PySATConfigurationsNumber
 from .pysat_commonality import PySATCommonality
@@ -8,11 +11,15 @@ from .pysat_core_features import PySATCoreFeatures
 from .pysat_dead_features import PySATDeadFeatures
 from .pysat_false_optional_features import PySATFalseOptionalFeatures
 from .pysat_metrics import PySATMetrics
+from .pysat_sampling import PySATSampling
+from .pysat_twise_sampling import PySATTWiseSampling
+from .pysat_unique_features import PySATUniqueFeatures
 
 
 __all__ = [
     'PySATSatisfiable',
     'PySATSatisfiableConfiguration',
+    'PySATSatisfiableConfigurationBatch',
     'PySATConfigurations',
     'PySATConfigurationsNumber',
     'PySATCommonality',
@@ -21,4 +28,7 @@ __all__ = [
     'PySATDeadFeatures',
     'PySATFalseOptionalFeatures',
     'PySATMetrics',
+    'PySATSampling',
+    'PySATTWiseSampling',
+    'PySATUniqueFeatures',
 ]
@@ -0,0 +1,68 @@
+from typing import Any, Optional
+
+from pysat.solvers import Solver
+
+from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from .pysat_parallel import parallel_map
+
+
+def backbone(model: PySATModel, processes: int = 1) -> Optional[set[int]]:
+    """Return the backbone of the model restricted to its feature variables.
+
+    The backbone is the set of literals that hold in every configuration: positive
+    literals are core features and negative literals are dead features.
+    Returns None if the model is not satisfiable.
+
+    Every satisfying assignment found discards the candidates it falsifies (model
+    filtering), so a variable seen both true and false is never queried again and the
+    number of SAT calls is far below one per variable.
+
+    With `processes` > 1, the candidates are split in chunks checked by a process pool.
+    The backbone is cached in the analysis cache of the model.
+    """
+    literals = model.get_analysis_cache().get('backbone', lambda: _backbone(model, processes))
+    return None if literals is None else set(literals)
+
+
+def _backbone(model: PySATModel, processes: int) -> Optional[frozenset[int]]:
+    session = model.get_session()
+    if not session.solve():
+        return None
+
+    assignment = set(session.get_model())
+    candidates = [lit for var in model.variables.values() for lit in (var, -var)
+                  if lit in assignment]
+    if processes > 1:
+        return frozenset(parallel_map(model, backbone_literals, candidates, processes))
+    return frozenset(backbone_literals(session.solver, candidates))
+
+
+def backbone_literals(solver: Solver, candidates: list[int]) -> list[int]:
+    """Return the candidate literals (all true in some model) that are in the backbone."""
+    remaining = set(candidates)
+    result = []
+    for literal in candidates:
+        if literal not in remaining:
+            continue
+        if solver.solve(assumptions=[-literal]):
+            assignment = set(solver.get_model())
+            remaining = {lit for lit in remaining if lit in assignment}
+        else:
+            result.append(literal)
+    return result
+
+
+def core_and_dead_features(model: PySATModel,
+                           processes: int = 1) -> tuple[list[Any], list[Any]]:
+    """Return the core and dead features of the model from a single backbone computation.
+
+    If the model is not satisfiable, there are no core features and every feature is dead.
+    """
+    literals = backbone(model, processes)
+    if literals is None:
+        return [], list(model.variables.keys())
+    core_features = [name for name, variable in model.variables.items() if variable in literals]
+    dead_features = [name for name, variable in model.variables.items()
+                     if -variable in literals]
+    return core_features, dead_features
+
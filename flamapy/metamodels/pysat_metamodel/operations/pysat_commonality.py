@@ -1,10 +1,18 @@
+from typing import Any, cast
+
 from flamapy.core.operations import Commonality
 from flamapy.core.models import VariabilityModel
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
-from .pysat_configurations import PySATConfigurations
+from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from .pysat_configurations_number import configurations_number
 
 
 class PySATCommonality(Commonality):
+    """Ratio of configurations in which a feature is selected.
+
+    It is computed as count(F ∧ feature) / count(F) on the d-DNNF compilation of the model,
+    so the configurations are never enumerated.
+    """
 
     def __init__(self) -> None:
         self.result: float = 0
@@ -20,16 +28,36 @@ class PySATCommonality(Commonality):
         return self.result
 
     def execute(self, model: VariabilityModel) -> 'PySATCommonality':
-        pysat_products_op = PySATConfigurations()
-        pysat_products_op.execute(model)
-        products = pysat_products_op.get_result()
-
+        sat_model = cast(PySATModel, model)
         feature = list(self.configuration.elements.keys())[0]
+        self.result = commonality(sat_model, _feature_name(feature))
+        return self
 
-        count = 0
-        for product in products:
-            count = count + 1 if feature in product else count
 
-        self.result = count / len(products)
+def commonality(model: PySATModel, feature: str) -> float:
+    ddnnf = model.get_ddnnf()
+    variable = model.get_variable(feature)
+    total = configurations_number(model)
+    if total == 0 or variable > ddnnf.n_variables:
+        return 0.0
+    return ddnnf.count([variable]) / total
 
-        return self
+
+def commonalities(model: PySATModel) -> dict[str, float]:
+    """Return the commonality of every feature of the model.
+
+    All the ratios come from one traversal of the shared d-DNNF compilation.
+    """
+    return dict(model.get_analysis_cache().get('commonalities', lambda: _commonalities(model)))
+
+
+def _commonalities(model: PySATModel) -> dict[str, float]:
+    ddnnf = model.get_ddnnf()
+    total = ddnnf.count()
+    counts = ddnnf.literal_counts()
+    return {name: counts.get(variable, 0) / total if total != 0 else 0.0
+            for name, variable in model.variables.items()}
+
+
+def _feature_name(feature: Any) -> str:
+    return feature if isinstance(feature, str) else feature.name
@@ -1,6 +1,5 @@
-from typing import Any, cast
-
-from pysat.solvers import Solver
+import itertools
+from typing import Any, cast, Iterator, Optional
 
 from flamapy.core.operations import Configurations
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
@@ -9,10 +8,24 @@ from flamapy.core.models import VariabilityModel
 
 
 class PySATConfigurations(Configurations):
+    """Enumerate the configurations of the model.
+
+    Optionally, the enumeration can be bounded (`set_limit`) and projected onto a subset of
+    features (`set_projection`), in which case each distinct selection of those features
+    is returned once. Use `iter_configurations` to stream configurations instead of
+    materializing them. The complete enumeration is kept in the analysis cache of the model.
+    """
 
     def __init__(self) -> None:
         self.result: list[Configuration] = []
-        self.solver = Solver(name='glucose3')
+        self.limit: Optional[int] = None
+        self.projection: Optional[list[str]] = None
+
+    def set_limit(self, limit: Optional[int]) -> None:
+        self.limit = limit
+
+    def set_projection(self, features: Optional[list[str]]) -> None:
+        self.projection = features
 
     def get_configurations(self) -> list[Configuration]:
         return self.get_result()
@@ -22,20 +35,42 @@ class PySATConfigurations(Configurations):
 
     def execute(self, model: VariabilityModel) -> 'PySATConfigurations':
         sat_model = cast(PySATModel, model)
-        self.result = configurations(self.solver, sat_model)
+        if self.projection is None and (self.limit is None
+                                        or 'configurations' in sat_model.get_analysis_cache()):
+            self.result = configurations(sat_model)[:self.limit]
+        else:
+            self.result = list(iter_configurations(sat_model, self.limit, self.projection))
         return self
 
 
-def configurations(solver: Solver, model: PySATModel) -> list[Configuration]:
-    for clause in model.get_all_clauses():
-        solver.add_clause(clause)
+def configurations(model: PySATModel) -> list[Configuration]:
+    """Return all the configurations of the model (a new list, cached configurations)."""
+    cache = model.get_analysis_cache()
+    return list(cache.get('configurations', lambda: list(iter_configurations(model))))
+
+
+def iter_configurations(model: PySATModel,
+                        limit: Optional[int] = None,
+                        projection: Optional[list[str]] = None,
+                        assumptions: Optional[list[int]] = None) -> Iterator[Configuration]:
+    """Yield the configurations of the model as the solver finds them.
+
+    :param limit: maximum number of configurations to yield (None means no limit)
+    :param projection: names of the features the configurations are projected onto
+    :param assumptions: literals every configuration must satisfy
+    """
+    variables = None
+    if projection is not None:
+        variables = [model.get_variable(feature) for feature in projection]
+    solutions = model.get_session().enum_models(assumptions, variables)
+    for solution in itertools.islice(solutions, limit):
+        yield to_configuration(model, solution)
+
 
-    result = []
-    for solutions in solver.enum_models():
-        product: dict[Any, bool] = {}
-        for variable in solutions:
-            if variable > 0:
-                product[model.features.get(variable)] = True
-        result.append(Configuration(product))
-    solver.delete()
-    return result
+def to_configuration(model: PySATModel, solution: list[int]) -> Configuration:
+    """Return the configuration of the features selected by a model of the formula."""
+    product: dict[Any, bool] = {}
+    for variable in solution:
+        if variable > 0 and variable in model.features:
+            product[model.features[variable]] = True
+    return Configuration(product)
@@ -1,17 +1,20 @@
 from typing import Any, cast
 
-from pysat.solvers import Solver
-
 from flamapy.core.operations import DeadFeatures
 from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
 from flamapy.core.models import VariabilityModel
+from .pysat_backbone import core_and_dead_features
 
 
 class PySATDeadFeatures(DeadFeatures):
 
     def __init__(self) -> None:
         self.dead_features: list[Any] = []
-        self.solver = Solver(name='glucose3')
+        self.processes = 1
+
+    def set_processes(self, processes: int) -> None:
+        """Check the features in a pool of `processes` worker processes (1 means no pool)."""
+        self.processes = processes
 
     def get_dead_features(self) -> list[Any]:
         return self.dead_features
@@ -21,14 +24,5 @@ class PySATDeadFeatures(DeadFeatures):
 
     def execute(self, model: VariabilityModel) -> 'PySATDeadFeatures':
         model = cast(PySATModel, model)
-
-        for clause in model.get_all_clauses():  # AC es conjunto de conjuntos
-            self.solver.add_clause(clause)  # añadimos la constraint
-
-        dead_features = []
-        for variable in model.variables.items():
-            if not self.solver.solve(assumptions=[variable[1]]):
-                dead_features.append(variable[0])
-        self.dead_features = dead_features
-        self.solver.delete()
+        self.dead_features = core_and_dead_features(model, self.processes)[1]
         return self
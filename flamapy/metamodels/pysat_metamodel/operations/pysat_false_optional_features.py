@@ -1,13 +1,12 @@
 import logging
 from typing import Any, cast
 
-from pysat.solvers import Solver
-
 from flamapy.core.operations import FalseOptionalFeatures
 from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
 from flamapy.metamodels.fm_metamodel.models.feature_model import FeatureModel
 from flamapy.core.models import VariabilityModel, VariabilityElement
 from flamapy.core.exceptions import FlamaException
+from .pysat_parallel import parallel_map, unsatisfiable_assumptions
 
 
 LOGGER = logging.getLogger('PySATFalseOptionalFeatures')
@@ -17,11 +16,17 @@ class PySATFalseOptionalFeatures(FalseOptionalFeatures):
 
     def __init__(self) -> None:
         self.result: list[Any] = []
-        self.solver = Solver(name='glucose3')
+        self.processes = 1
+
+    def set_processes(self, processes: int) -> None:
+        """Check the features in a pool of `processes` worker processes (1 means no pool)."""
+        self.processes = processes
 
     def execute(self, model: VariabilityModel) -> 'PySATFalseOptionalFeatures':
         sat_model = cast(PySATModel, model)
-        self.result = self._get_false_optional_features(sat_model)
+        cache = sat_model.get_analysis_cache()
+        self.result = list(cache.get('false_optional_features',
+                                     lambda: self._get_false_optional_features(sat_model)))
         return self
 
     def get_false_optional_features(self) -> list[VariabilityElement]:
@@ -40,18 +45,22 @@ class PySATFalseOptionalFeatures(FalseOptionalFeatures):
         real_optional_features = [f for f in feature_model.get_features()
                                   if not f.is_root() and not f.is_mandatory()]
 
-        result = []
-        for clause in sat_model.get_all_clauses():
-            self.solver.add_clause(clause)
-
+        features = []
+        assumptions_list = []
         for feature in real_optional_features:
             variable = sat_model.variables.get(feature.name)
             parent_feature = feature.get_parent()
             if parent_feature is not None:
                 parent_variable = sat_model.variables.get(parent_feature.name)
-                assert variable is not None
-                satisfiable = self.solver.solve(assumptions=[parent_variable, -variable])
-                if not satisfiable:
-                    result.append(feature)
-        self.solver.delete()
-        return result
+                assert variable is not None and parent_variable is not None
+                features.append(feature)
+                assumptions_list.append([parent_variable, -variable])
+
+        if self.processes > 1:
+            unsatisfiable = parallel_map(sat_model, unsatisfiable_assumptions,
+                                         assumptions_list, self.processes)
+        else:
+            solver = sat_model.get_session().solver
+            unsatisfiable = unsatisfiable_assumptions(solver, assumptions_list)
+        return [feature for feature, false_optional in zip(features, unsatisfiable)
+                if false_optional]
@@ -1,6 +1,5 @@
-from typing import Any, cast
-
-from pysat.solvers import Solver
+import itertools
+from typing import Any, Iterator, Optional, cast
 
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
 from flamapy.core.operations import Filter
@@ -9,11 +8,22 @@ from flamapy.core.models import VariabilityModel
 
 
 class PySATFilter(Filter):
+    """Products (lists of selected features) that extend the configuration.
+
+    The products can be bounded (`set_limit`) and projected onto a subset of features
+    (`set_projection`), in which case each distinct selection of those features is returned
+    once. With `set_count_only`, only their number is computed (`get_count`), without
+    enumerating them: it is counted on the d-DNNF compilation of the model, unless a
+    projection is set.
+    """
 
     def __init__(self) -> None:
         self.filter_products: list[list[Any]] = []
         self.configuration = Configuration({})
-        self.solver = Solver(name='glucose3')
+        self.limit: Optional[int] = None
+        self.projection: Optional[list[str]] = None
+        self.count_only = False
+        self.count = 0
 
     def get_filter_products(self) -> list[list[Any]]:
         return self.filter_products
@@ -21,29 +31,58 @@ class PySATFilter(Filter):
     def get_result(self) -> list[list[Any]]:
         return self.get_filter_products()
 
+    def get_count(self) -> int:
+        return self.count
+
     def set_configuration(self, configuration: Configuration) -> None:
         self.configuration = configuration
 
+    def set_limit(self, limit: Optional[int]) -> None:
+        self.limit = limit
+
+    def set_projection(self, features: Optional[list[str]]) -> None:
+        self.projection = features
+
+    def set_count_only(self, count_only: bool) -> None:
+        self.count_only = count_only
+
     def execute(self, model: VariabilityModel) -> 'PySATFilter':
         model = cast(PySATModel, model)
-
-        for clause in model.get_all_clauses():  # AC es conjunto de conjuntos
-            self.solver.add_clause(clause)  # añadimos la constraint
-
-        assumptions = []
-        for feat in self.configuration.elements.items():
-            variable = model.variables.get(feat[0])
-            if variable is not None:
-                if feat[1]:
-                    assumptions.append(variable)
-                else:
-                    assumptions.append(-variable)
-
-        for solution in self.solver.enum_models(assumptions=assumptions):
-            product = []
-            for variable in solution:
-                if variable is not None and variable > 0:
-                    product.append(model.features.get(variable))
-            self.filter_products.append(product)
-        self.solver.delete()
+        if self.count_only:
+            self.count = count_products(model, self.configuration, self.limit, self.projection)
+        else:
+            self.filter_products = list(iter_products(model, self.configuration,
+                                                      self.limit, self.projection))
+            self.count = len(self.filter_products)
         return self
+
+
+def iter_products(model: PySATModel,
+                  configuration: Configuration,
+                  limit: Optional[int] = None,
+                  projection: Optional[list[str]] = None) -> Iterator[list[Any]]:
+    """Yield the products extending the configuration as the solver finds them.
+
+    Features of the configuration that are not in the model are ignored.
+    """
+    assumptions = model.configuration_to_assumptions(configuration)[0]
+    variables = None
+    if projection is not None:
+        variables = [model.get_variable(feature) for feature in projection]
+    solutions = model.get_session().enum_models(assumptions, variables)
+    for solution in itertools.islice(solutions, limit):
+        yield [model.features[variable] for variable in solution
+               if variable > 0 and variable in model.features]
+
+
+def count_products(model: PySATModel,
+                   configuration: Configuration,
+                   limit: Optional[int] = None,
+                   projection: Optional[list[str]] = None) -> int:
+    """Return the number of products extending the configuration (at most `limit`)."""
+    if projection is not None:
+        # projected counting is not supported by the compilation: enumerate the projections
+        return sum(1 for _ in iter_products(model, configuration, limit, projection))
+    assumptions = model.configuration_to_assumptions(configuration)[0]
+    count = model.get_ddnnf().count(assumptions)
+    return count if limit is None else min(count, limit)
@@ -5,6 +5,10 @@ from flamapy.core.exceptions import FlamaException
 from flamapy.core.operations.metrics_operation import Metrics
 from flamapy.metamodels.pysat_metamodel.models import PySATModel
 from flamapy.metamodels.pysat_metamodel import operations as sat_operations
+from .pysat_backbone import core_and_dead_features
+from .pysat_configurations_number import configurations_number
+from .pysat_satisfiable import valid
+from .pysat_unique_features import unique_features
 
 
 def metric_method(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -24,6 +28,12 @@ def metric_method(func: Callable[..., Any]) -> Callable[..., Any]:
 
 
 class PySATMetrics(Metrics):
+    """Metrics of a PySATModel.
+
+    The analyses behind the metrics (satisfiability, backbone, counts, enumerations) go
+    through the analysis cache of the model, so each one is run at most once, also across
+    the standalone operations run on the same model.
+    """
 
     def __init__(self) -> None:
         super().__init__()
@@ -42,8 +52,7 @@ class PySATMetrics(Metrics):
 
         #Do some basic calculations to speedup the rest
         self._features = self.model.features
-        self._common_features = sat_operations.PySATCoreFeatures().execute(self.model).get_result()
-        self._dead_features = sat_operations.PySATDeadFeatures().execute(self.model).get_result()
+        self._common_features, self._dead_features = core_and_dead_features(self.model)
         # Get all methods that are marked with the metric_method decorator
         metric_methods = [getattr(self, method_name) for method_name in dir(self)
                           if callable(getattr(self, method_name)) and 
@@ -60,7 +69,7 @@ class PySATMetrics(Metrics):
         if self.model is None:
             raise FlamaException('Model not initialized.')
         name = "Satisfiable"
-        _satisfiable = sat_operations.PySATSatisfiable().execute(self.model).get_result()
+        _satisfiable = valid(cast(PySATModel, self.model))
         result = self.construct_result(name=name, 
                                        doc=self.satisfiable.__doc__, result=_satisfiable)
         return result
@@ -94,10 +103,8 @@ class PySATMetrics(Metrics):
     @metric_method
     def dead_features(self) -> dict[str, Any]:
         """Features that cannot appear in any configuration."""
-        if self.model is None:
-            raise FlamaException('Model not initialized.')
         name = "Dead features"
-        _dead_features = sat_operations.PySATDeadFeatures().execute(self.model).get_result()
+        _dead_features = self._dead_features
         result = self.construct_result(name=name,
                                        doc=self.dead_features.__doc__,
                                        result=_dead_features,
@@ -108,22 +115,10 @@ class PySATMetrics(Metrics):
     @metric_method
     def unique_features(self) -> dict[str, Any]:
         """Features that appear in exactly one configuration."""
+        if self.model is None:
+            raise FlamaException('Model not initialized.')
         name = "Unique features"
-
-        seen_once = set()
-        seen_multiple = set()
-
-        # Step 2: Iterate through each configuration
-        for config in self.configurations()["result"]:
-            for feature in config:
-                if feature in seen_once:
-                    seen_multiple.add(feature)
-                else:
-                    seen_once.add(feature)
-
-        # Step 3: Find features that are in seen_once but not in seen_multiple
-        _unique_features = seen_once - seen_multiple
-
+        _unique_features = unique_features(cast(PySATModel, self.model))
         result = self.construct_result(name=name,
                                        doc=self.unique_features.__doc__,
                                        result=_unique_features,
@@ -155,9 +150,8 @@ class PySATMetrics(Metrics):
         if self.model is None:
             raise FlamaException('Model not initialized.')
         name = "Configurations"
-        _configurations = sat_operations.PySATConfigurations().execute(self.model).get_result()
+        _configurations = configurations_number(cast(PySATModel, self.model))
         result = self.construct_result(name=name,
                                        doc=self.configurations.__doc__,
-                                       result=_configurations,
-                                       size=len(_configurations))
+                                       result=_configurations)
         return result
@@ -0,0 +1,132 @@
+"""
+Process pool running independent solver queries on a PySATModel.
+
+Every worker builds its own solver once, from the clause store of the model, which is
+serialized a single time for the whole pool. Work is split in contiguous chunks and results
+are returned in the order of the chunks, so they do not depend on scheduling.
+
+A portfolio instead races several solver backends on the same query, one process each, and
+keeps the first answer.
+"""
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from pysat.solvers import Solver
+
+from flamapy.core.exceptions import FlamaException
+from flamapy.metamodels.pysat_metamodel.models.pysat_clauses import PySATClauses
+from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from flamapy.metamodels.pysat_metamodel.models.pysat_session import check_solver_name
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_SOLVER: Optional[Solver] = None  # solver of the current worker process
+
+PORTFOLIO = ('cadical153', 'glucose4', 'maplechrono', 'lingeling')
+
+_POLL_INTERVAL = 0.1  # seconds between checks that the racers are still alive
+
+
+def parallel_map(model: PySATModel,
+                 function: Callable[[Solver, list[T]], list[R]],
+                 items: list[T],
+                 processes: int,
+                 chunks_per_process: int = 4) -> list[R]:
+    """Apply `function(solver, chunk)` to contiguous chunks of `items` in a pool of
+    `processes` workers and return the concatenation of the results in item order.
+
+    `function` must be a module-level function (it is sent to the workers by reference).
+    """
+    if not items:
+        return []
+    n_chunks = min(len(items), processes * chunks_per_process)
+    size = -(-len(items) // n_chunks)  # ceiling division
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+    session = model.get_session()
+    with ProcessPoolExecutor(max_workers=processes,
+                             initializer=_init_worker,
+                             initargs=(model.get_all_clauses(), session.solver_name)) as pool:
+        results = pool.map(_run_chunk, [function] * len(chunks), chunks)
+        return [result for chunk_results in results for result in chunk_results]
+
+
+def portfolio_solve(model: PySATModel,
+                    assumptions: Optional[list[int]] = None,
+                    solver_names: Sequence[str] = PORTFOLIO) -> tuple[bool, str]:
+    """Race the solver backends on the model under the assumptions, one process each.
+
+    Return the satisfiability and the name of the backend that answered first; the other
+    processes are terminated. Assumptions are added as unit clauses, so backends without
+    support for assumptions (e.g., lingeling) can take part. A racer that dies without
+    answering (e.g., a native abort or an out-of-memory kill) counts as a failed backend.
+    """
+    for solver_name in solver_names:
+        check_solver_name(solver_name)
+    context = multiprocessing.get_context()
+    answers = context.Queue()
+    clauses = model.get_all_clauses()
+    racers = [context.Process(target=_race,
+                              args=(index, solver_name, clauses, assumptions or [], answers),
+                              daemon=True)
+              for index, solver_name in enumerate(solver_names)]
+    for racer in racers:
+        racer.start()
+    try:
+        errors = []
+        pending = dict(enumerate(racers))
+        while pending:
+            try:
+                index, satisfiable, error = answers.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                # racers that exit normally have put their answer before exiting
+                for index, racer in list(pending.items()):
+                    if not racer.is_alive() and racer.exitcode != 0:
+                        errors.append(f'{solver_names[index]}: '
+                                      f'exited with code {racer.exitcode}')
+                        del pending[index]
+                continue
+            if satisfiable is not None:
+                return satisfiable, solver_names[index]
+            if pending.pop(index, None) is not None:
+                errors.append(f'{solver_names[index]}: {error}')
+        raise FlamaException(f'No solver of the portfolio answered ({"; ".join(errors)}).')
+    finally:
+        for racer in racers:
+            racer.terminate()
+        for racer in racers:
+            racer.join()
+
+
+def unsatisfiable_assumptions(solver: Solver, assumptions_list: list[list[int]]) -> list[bool]:
+    """Return, for every list of assumptions, whether the formula is unsatisfiable under it."""
+    return [not solver.solve(assumptions=assumptions) for assumptions in assumptions_list]
+
+
+def _init_worker(clauses: PySATClauses, solver_name: str) -> None:
+    global _SOLVER  # pylint: disable=global-statement
+    _SOLVER = Solver(name=solver_name)
+    clauses.load_into(_SOLVER)
+
+
+def _run_chunk(function: Callable[[Solver, list[Any]], list[Any]], chunk: list[Any]) -> list[Any]:
+    assert _SOLVER is not None
+    return function(_SOLVER, chunk)
+
+
+def _race(index: int,
+          solver_name: str,
+          clauses: PySATClauses,
+          assumptions: list[int],
+          answers: Any) -> None:
+    try:
+        with Solver(name=solver_name) as solver:
+            clauses.load_into(solver)
+            for literal in assumptions:
+                solver.add_clause([literal])
+            answers.put((index, bool(solver.solve()), None))
+    except Exception as exception:  # pylint: disable=broad-except
+        answers.put((index, None, repr(exception)))
@@ -1,22 +1,29 @@
-from typing import Any, cast, Optional
-
-from pysat.solvers import Solver
+import random
+from typing import Iterable, cast, Optional
 
 from flamapy.core.models import VariabilityModel
 from flamapy.core.operations import Sampling
 from flamapy.core.exceptions import FlamaException
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
 from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from flamapy.metamodels.pysat_metamodel.operations.pysat_configurations import to_configuration
 
 
 class PySATSampling(Sampling):
+    """Uniform random sample of the configurations of the model.
+
+    Each configuration is drawn with the same probability, among those that extend the
+    partial configuration if one is set. Without replacement, the configurations of the
+    sample are distinct (all of them are returned if there are fewer than `sample_size`).
+    Set a seed to make the sample reproducible.
+    """
 
     def __init__(self) -> None:
         self.result: list[Configuration] = []
         self.sample_size: int = 0
         self.with_replacement: bool = False
         self.partial_configuration: Configuration = None
-        self.solver = Solver(name='glucose3')
+        self.seed: Optional[int] = None
 
     def set_sample_size(self, sample_size: int) -> None:
         if sample_size < 0:
@@ -29,6 +36,9 @@ class PySATSampling(Sampling):
     def set_partial_configuration(self, partial_configuration: Configuration) -> None:
         self.partial_configuration = partial_configuration
 
+    def set_seed(self, seed: Optional[int]) -> None:
+        self.seed = seed
+
     def get_sample(self) -> list[Configuration]:
         return self.get_result()
 
@@ -37,35 +47,48 @@ class PySATSampling(Sampling):
 
     def execute(self, model: VariabilityModel) -> 'PySATSampling':
         sat_model = cast(PySATModel, model)
-        self.result = sample(self.solver, 
-                             sat_model, 
-                             self.sample_size, 
-                             self.with_replacement, 
-                             self.partial_configuration)
+        self.result = sample(sat_model,
+                             self.sample_size,
+                             self.with_replacement,
+                             self.partial_configuration,
+                             self.seed)
         return self
 
 
-def sample(solver: Solver,
-           model: PySATModel, 
-           sample_size: int, 
-           with_replacement: bool,  # pylint: disable=unused-argument
-           partial_configuration: Optional[Configuration]  # pylint: disable=unused-argument
-           ) -> list[Configuration]:
+def sample(model: PySATModel,
+           sample_size: int,
+           with_replacement: bool,
+           partial_configuration: Optional[Configuration],
+           seed: Optional[int] = None) -> list[Configuration]:
+    """Draw a uniform random sample of configurations.
+
+    A rank is drawn uniformly among the models counted by the d-DNNF compilation of the
+    model (conditioned on the partial configuration) and the model with that rank is
+    rebuilt from the circuit. Auxiliary variables are determined by the features, so
+    models and configurations are in one-to-one correspondence.
+    """
     if sample_size == 0:
         return []
 
-    for clause in model.get_all_clauses():
-        solver.add_clause(clause)
-
-    products = []
-    for solutions in solver.enum_models():
-        product: dict[Any, bool] = {}
-        for variable in solutions:
-            if variable > 0:
-                product[model.features.get(variable)] = True
-        products.append(Configuration(product))
-        if len(products) == sample_size:
-            solver.delete()
-            return products
-    solver.delete()
-    return products
+    assumptions: list[int] = []
+    if partial_configuration is not None:
+        assumptions, missing = model.configuration_to_assumptions(partial_configuration)
+        if missing:
+            raise FlamaException(f'Features {missing} not found')
+    ddnnf = model.get_ddnnf()
+    values = ddnnf.values(assumptions)
+    total = values[ddnnf.root]
+    if total == 0:
+        return []
+
+    rng = random.Random(seed)
+    ranks: Iterable[int]
+    if with_replacement:
+        ranks = (rng.randrange(total) for _ in range(sample_size))
+    else:
+        # random.sample does not take populations of more than 2**63 models
+        distinct: dict[int, None] = {}
+        while len(distinct) < min(sample_size, total):
+            distinct[rng.randrange(total)] = None
+        ranks = distinct
+    return [to_configuration(model, ddnnf.unrank(rank, values)) for rank in ranks]
@@ -1,18 +1,31 @@
-from typing import cast
-
-from pysat.solvers import Solver
+from typing import Optional, Sequence, cast
 
 from flamapy.core.operations import Satisfiable
 
 from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
 from flamapy.core.models import VariabilityModel
+from .pysat_parallel import portfolio_solve
 
 
 class PySATSatisfiable(Satisfiable):
+    """Whether the model has at least one configuration.
+
+    By default, the query runs on the solver of the model. In portfolio mode
+    (`set_portfolio`), several solver backends race on it in parallel processes and the
+    first answer is kept; `get_fastest_solver` tells which backend gave it.
+    """
 
     def __init__(self) -> None:
         self.result = False
-        self.solver = Solver(name='glucose3')
+        self.portfolio: Optional[Sequence[str]] = None
+        self.fastest_solver: Optional[str] = None
+
+    def set_portfolio(self, solver_names: Optional[Sequence[str]]) -> None:
+        """Race these backends (e.g., PORTFOLIO of pysat_parallel), or None to disable."""
+        self.portfolio = solver_names
+
+    def get_fastest_solver(self) -> Optional[str]:
+        return self.fastest_solver
 
     def is_satisfiable(self) -> bool:
         return self.get_result()
@@ -22,13 +35,13 @@ class PySATSatisfiable(Satisfiable):
 
     def execute(self, model: VariabilityModel) -> 'PySATSatisfiable':
         sat_model = cast(PySATModel, model)
-        self.result = valid(self.solver, sat_model)
+        if self.portfolio is None:
+            self.result = valid(sat_model)
+        else:
+            self.result, self.fastest_solver = portfolio_solve(sat_model,
+                                                               solver_names=self.portfolio)
         return self
 
 
-def valid(solver: Solver, model: PySATModel) -> bool:
-    for clause in model.get_all_clauses():
-        solver.add_clause(clause)
-    result = solver.solve()
-    solver.delete()
-    return result
+def valid(model: PySATModel) -> bool:
+    return model.get_analysis_cache().get('satisfiable', lambda: model.get_session().solve())
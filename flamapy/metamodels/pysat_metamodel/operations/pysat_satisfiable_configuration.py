@@ -1,20 +1,24 @@
-from typing import cast
-
-from pysat.solvers import Solver
+from typing import Iterable, Optional, Sequence, cast
 
 from flamapy.core.models import VariabilityModel
-from flamapy.core.operations import SatisfiableConfiguration
+from flamapy.core.operations import Operation, SatisfiableConfiguration
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
 from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from .pysat_parallel import portfolio_solve
 
 
 class PySATSatisfiableConfiguration(SatisfiableConfiguration):
+    """Whether the configuration can be completed to (or is, if full) a valid configuration.
+
+    In portfolio mode (`set_portfolio`), several solver backends race on the query in
+    parallel processes and the first answer is kept.
+    """
 
     def __init__(self) -> None:
         self.result = False
         self.configuration = Configuration(elements={})
-        self.solver = Solver(name='glucose3')
         self.is_full = False
+        self.portfolio: Optional[Sequence[str]] = None
 
     def is_satisfiable(self) -> bool:
         return self.result
@@ -26,38 +30,95 @@ class PySATSatisfiableConfiguration(SatisfiableConfiguration):
         self.configuration = configuration
         self.is_full = is_full
 
+    def set_portfolio(self, solver_names: Optional[Sequence[str]]) -> None:
+        """Race these backends (e.g., PORTFOLIO of pysat_parallel), or None to disable."""
+        self.portfolio = solver_names
+
     def execute(self, model: VariabilityModel) -> 'PySATSatisfiableConfiguration':
         sat_model = cast(PySATModel, model)
 
-        for clause in sat_model.get_all_clauses():  # AC es conjunto de conjuntos
-            self.solver.add_clause(clause)  # añadimos la constraint
+        assumptions, missing_features = sat_model.configuration_to_assumptions(
+            self.configuration, self.is_full)
+        if missing_features:
+            print("The features that are missing are:", list(missing_features))
+            print("The feature model contains the following features:",
+                  list(sat_model.variables.keys()))
+            self.result = False
+            return self
 
-        if not self.is_full:
-            assumptions = []
-            for feature, selected in self.configuration.elements.items():
-                if selected:
-                    assumptions.append(sat_model.variables[feature])
-                else:
-                    assumptions.append(-sat_model.variables[feature])
+        if self.portfolio is None:
+            self.result = sat_model.get_session().solve(assumptions=assumptions)
         else:
-            missing_features = [feature for feature in self.configuration.elements.keys() 
-                                if feature not in sat_model.variables.keys()]
-
-            if missing_features:
-                print("The features that are missing are:", list(missing_features))
-                print("The feature model contains the following features:", 
-                      list(sat_model.variables.keys()))
-                self.result = False
-                return self
-
-            assumptions = []
-            for feature in sat_model.features.values():
-
-                if feature in self.configuration.elements.keys():
-                    assumptions.append(sat_model.variables[feature])
-                else:
-                    assumptions.append(-sat_model.variables[feature])
-
-        self.result = self.solver.solve(assumptions=assumptions)
-        self.solver.delete()
-        return self
\ No newline at end of file
+            self.result = portfolio_solve(sat_model, assumptions, self.portfolio)[0]
+        return self
+
+
+class PySATSatisfiableConfigurationBatch(Operation):
+    """Validate many configurations (all full or all partial) against the model.
+
+    The clauses are loaded once in the model's solver and each configuration is checked
+    through assumptions. Optionally, for each invalid configuration, the solver's unsat core
+    gives the offending selections: a subset of the configuration that cannot be completed
+    to a valid configuration (it is not necessarily minimal).
+    """
+
+    def __init__(self) -> None:
+        self.result: list[bool] = []
+        self.cores: list[Optional[Configuration]] = []
+        self.configurations: Iterable[Configuration] = []
+        self.is_full = False
+        self.with_cores = False
+
+    def set_configurations(self,
+                           configurations: Iterable[Configuration],
+                           is_full: bool) -> None:
+        self.configurations = configurations
+        self.is_full = is_full
+
+    def set_with_cores(self, with_cores: bool) -> None:
+        self.with_cores = with_cores
+
+    def get_result(self) -> list[bool]:
+        return self.result
+
+    def get_cores(self) -> list[Optional[Configuration]]:
+        """Return the offending selections of every invalid configuration (None for the
+        valid ones), if cores were requested."""
+        return self.cores
+
+    def execute(self, model: VariabilityModel) -> 'PySATSatisfiableConfigurationBatch':
+        sat_model = cast(PySATModel, model)
+        self.result, self.cores = validate_configurations(sat_model, self.configurations,
+                                                          self.is_full, self.with_cores)
+        return self
+
+
+def validate_configurations(model: PySATModel,
+                            configurations: Iterable[Configuration],
+                            is_full: bool,
+                            with_cores: bool = False
+                            ) -> tuple[list[bool], list[Optional[Configuration]]]:
+    """Return whether each configuration is valid and, if `with_cores`, the offending
+    selections of each invalid one (the features unknown to the model, if any)."""
+    session = model.get_session()
+    verdicts = []
+    cores: list[Optional[Configuration]] = []
+    for configuration in configurations:
+        assumptions, missing_features = model.configuration_to_assumptions(configuration,
+                                                                           is_full)
+        if missing_features:
+            verdicts.append(False)
+            if with_cores:
+                cores.append(Configuration({feature: configuration.elements[feature]
+                                            for feature in missing_features}))
+            continue
+        valid = session.solve(assumptions=assumptions)
+        verdicts.append(valid)
+        if with_cores:
+            cores.append(None if valid else _core_to_configuration(model, session.get_core()))
+    return verdicts, cores
+
+
+def _core_to_configuration(model: PySATModel, core: list[int]) -> Configuration:
+    return Configuration({model.features[abs(literal)]: literal > 0 for literal in core
+                          if abs(literal) in model.features})
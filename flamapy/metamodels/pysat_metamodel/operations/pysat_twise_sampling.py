@@ -0,0 +1,227 @@
+import itertools
+import random
+from math import comb
+from typing import Any, Iterator, Optional, TypeVar, cast
+
+from flamapy.core.exceptions import FlamaException
+from flamapy.core.models import VariabilityModel
+from flamapy.core.operations import Operation
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from flamapy.metamodels.pysat_metamodel.models.pysat_session import PySATSession
+from flamapy.metamodels.pysat_metamodel.operations.pysat_backbone import backbone
+from flamapy.metamodels.pysat_metamodel.operations.pysat_configurations import to_configuration
+
+
+T = TypeVar('T')
+
+
+class PySATTWiseSampling(Operation):
+    """T-wise covering array: a small set of configurations such that every valid
+    interaction of t features (each one selected or deselected) occurs in at least one
+    of them.
+
+    The sample is built greedily as in YASA: every interaction is merged into the
+    compatible partial configuration that needs the fewest new literals, or starts a new
+    one. Interactions are streamed in a shuffled order (features are shuffled, then
+    interactions within windows of `window` interactions), so that the first
+    configurations are not committed to the literals of the first features. All the checks
+    are assumptions on the model's incremental solver, so the configurations of the model
+    are never enumerated. Set a seed to make the sample reproducible.
+
+    `get_statistics` reports the number of interactions, how many are valid (appear in
+    some configuration) and how many of them the returned configurations cover.
+    """
+
+    def __init__(self) -> None:
+        self.result: list[Configuration] = []
+        self.t: int = 2  # pylint: disable=invalid-name
+        self.seed: Optional[int] = None
+        self.statistics: dict[str, Any] = {}
+
+    def set_t(self, t: int) -> None:  # pylint: disable=invalid-name
+        if t < 1:
+            raise FlamaException(f'The interaction strength t={t} must be positive.')
+        self.t = t
+
+    def set_seed(self, seed: Optional[int]) -> None:
+        self.seed = seed
+
+    def get_sample(self) -> list[Configuration]:
+        return self.get_result()
+
+    def get_result(self) -> list[Configuration]:
+        return self.result
+
+    def get_statistics(self) -> dict[str, Any]:
+        return self.statistics
+
+    def execute(self, model: VariabilityModel) -> 'PySATTWiseSampling':
+        sat_model = cast(PySATModel, model)
+        self.result, self.statistics = twise_sample(sat_model, self.t, self.seed)
+        return self
+
+
+class _PartialConfiguration:
+
+    def __init__(self, literals: set[int], model: set[int], implied: set[int]) -> None:
+        self.literals = literals  # literals the configuration is committed to
+        self.model = model  # a complete assignment satisfying the formula and `literals`
+        self.implied = implied  # literals implied by `literals` through unit propagation
+
+
+class _CoveringArray:
+    """The partial configurations of the sample, indexed by literal: for every literal, the
+    bitmasks of the configurations committed to it, whose model contains it, and where unit
+    propagation implies it."""
+
+    def __init__(self, session: PySATSession) -> None:
+        self.session = session
+        self.partials: list[_PartialConfiguration] = []
+        self.committed: dict[int, int] = {}
+        self.in_model: dict[int, int] = {}
+        self.in_implied: dict[int, int] = {}
+
+    def merge(self, literals: frozenset[int]) -> bool:
+        """Add the interaction to the compatible partial configuration that needs the fewest
+        new literals (without calling the solver if there is a choice), or to a new one.
+        Return False if the interaction is not valid."""
+        if _common(self.committed, literals):
+            return True  # already covered
+        alone = self.session.propagate(sorted(literals, key=abs))
+        if alone is None:
+            return False
+        blocked = 0
+        for literal in alone:
+            blocked |= self.in_implied.get(-literal, 0)
+        free = _common(self.in_model, literals)
+        candidates = sorted((len(literals - partial.literals), not free >> index & 1, index)
+                            for index, partial in enumerate(self.partials)
+                            if not blocked >> index & 1)
+        for _, needs_solver, index in candidates:
+            partial = self.partials[index]
+            if not needs_solver:
+                self._update(index, partial.literals | literals, partial.model,
+                             partial.implied | set(alone))
+                return True
+            assumptions = sorted(partial.literals | literals, key=abs)
+            implied = self.session.propagate(assumptions)
+            if implied is not None and self.session.solve(assumptions):
+                self._update(index, partial.literals | literals,
+                             set(self.session.get_model()), set(implied))
+                return True
+        if self.session.solve(sorted(literals, key=abs)):
+            self.partials.append(_PartialConfiguration(set(), set(), set()))
+            self._update(len(self.partials) - 1, set(literals),
+                         set(self.session.get_model()), set(alone))
+            return True
+        return False
+
+    def _update(self, index: int,
+                literals: set[int], model: set[int], implied: set[int]) -> None:
+        partial = self.partials[index]
+        bit = 1 << index
+        for index_map, old, new in ((self.committed, partial.literals, literals),
+                                    (self.in_model, partial.model, model),
+                                    (self.in_implied, partial.implied, implied)):
+            for literal in old - new:
+                index_map[literal] &= ~bit
+            for literal in new - old:
+                index_map[literal] = index_map.get(literal, 0) | bit
+        partial.literals, partial.model, partial.implied = literals, model, implied
+
+
+def twise_sample(model: PySATModel,
+                 t: int = 2,  # pylint: disable=invalid-name
+                 seed: Optional[int] = None,
+                 window: int = 16384) -> tuple[list[Configuration], dict[str, Any]]:
+    """Return a t-wise covering array of the model and its coverage statistics.
+
+    :param window: number of consecutive interactions shuffled together
+    """
+    session = model.get_session()
+    variables = sorted(model.variables.values())
+    random.Random(seed).shuffle(variables)
+    fixed = backbone(model)
+    statistics: dict[str, Any] = {
+        't': t,
+        'configurations': 0,
+        'interactions': comb(len(variables), t) * 2**t,
+        'valid_interactions': 0,
+        'covered_interactions': 0,
+        'invalid_interactions': 0,
+        'coverage': 1.0,
+    }
+    if fixed is None:
+        statistics['invalid_interactions'] = statistics['interactions']
+        return [], statistics
+
+    # Backbone literals hold in every configuration: they are dropped from the interactions,
+    # and interactions contradicting them are invalid without calling the solver.
+    array = _CoveringArray(session)
+    invalid: set[frozenset[int]] = set()
+    rng = random.Random(seed)
+    for literals in _shuffled(_reduced_interactions(variables, t, fixed), window, rng):
+        if literals is not None and literals not in invalid:
+            if not array.merge(literals):
+                invalid.add(literals)
+
+    models = [sorted(partial.model, key=abs) for partial in array.partials]
+    if not models:
+        # there are no interactions (e.g., fewer than t features): any configuration will do
+        session.solve()
+        models.append(session.get_model())
+    sample = [to_configuration(model, assignment) for assignment in models]
+
+    # coverage of the returned configurations
+    holds: dict[int, int] = {}
+    for index, assignment in enumerate(models):
+        for literal in assignment:
+            holds[literal] = holds.get(literal, 0) | 1 << index
+    valid = 0
+    covered = 0
+    for literals in _reduced_interactions(variables, t, fixed):
+        if literals is not None and literals not in invalid:
+            valid += 1
+            covered += _common(holds, literals) != 0
+    statistics['configurations'] = len(sample)
+    statistics['valid_interactions'] = valid
+    statistics['covered_interactions'] = covered
+    statistics['invalid_interactions'] = statistics['interactions'] - valid
+    statistics['coverage'] = covered / valid if valid else 1.0
+    return sample, statistics
+
+
+def _common(index_map: dict[int, int], literals: frozenset[int]) -> int:
+    """Return the bitmask of the configurations indexed under all the literals (-1, i.e.,
+    all of them, if there are no literals)."""
+    mask = -1
+    for literal in literals:
+        mask &= index_map.get(literal, 0)
+    return mask
+
+
+def _reduced_interactions(variables: list[int],
+                          t: int,  # pylint: disable=invalid-name
+                          fixed: set[int]) -> Iterator[Optional[frozenset[int]]]:
+    """Yield the interactions without their backbone literals, or None for those that
+    contradict the backbone."""
+    for interaction in _interactions(variables, t):
+        if any(-literal in fixed for literal in interaction):
+            yield None
+        else:
+            yield frozenset(literal for literal in interaction if literal not in fixed)
+
+
+def _interactions(variables: list[int], t: int  # pylint: disable=invalid-name
+                  ) -> Iterator[tuple[int, ...]]:
+    for combination in itertools.combinations(variables, t):
+        for signs in itertools.product((1, -1), repeat=len(combination)):
+            yield tuple(sign * variable for sign, variable in zip(signs, combination))
+
+
+def _shuffled(items: Iterator[T], window: int, rng: random.Random) -> Iterator[T]:
+    """Yield the items shuffled within consecutive windows of `window` items."""
+    while chunk := list(itertools.islice(items, window)):
+        rng.shuffle(chunk)
+        yield from chunk
@@ -0,0 +1,103 @@
+from typing import Any, cast
+
+from pysat.solvers import Solver
+
+from flamapy.core.exceptions import FlamaException
+from flamapy.core.models import VariabilityModel
+from flamapy.core.operations import Operation
+from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+
+
+class PySATUniqueFeatures(Operation):
+    """Features that appear in exactly one configuration.
+
+    A feature f is unique if count(F ∧ f) == 1. With the 'counting' method (the default),
+    the counts of all features come from one traversal of the d-DNNF compilation of the
+    model. With the 'sat' method, each feature is checked by looking for two configurations
+    that select it, which does not need the compilation. The configurations are never
+    enumerated, so both methods work on models with astronomically many products.
+    """
+
+    METHODS = ('counting', 'sat')
+
+    def __init__(self) -> None:
+        self.result: list[Any] = []
+        self.method = 'counting'
+
+    def set_method(self, method: str) -> None:
+        if method not in self.METHODS:
+            raise FlamaException(f'Unknown method {method}, expected one of {self.METHODS}.')
+        self.method = method
+
+    def get_unique_features(self) -> list[Any]:
+        return self.get_result()
+
+    def get_result(self) -> list[Any]:
+        return self.result
+
+    def execute(self, model: VariabilityModel) -> 'PySATUniqueFeatures':
+        sat_model = cast(PySATModel, model)
+        if self.method == 'counting':
+            self.result = unique_features(sat_model)
+        else:
+            self.result = unique_features_sat(sat_model)
+        return self
+
+
+def unique_features(model: PySATModel) -> list[Any]:
+    """Return the features selected in exactly one configuration, from the literal counts
+    of the d-DNNF compilation (cached in the analysis cache of the model)."""
+    cache = model.get_analysis_cache()
+    return list(cache.get('unique_features', lambda: _unique_features(model)))
+
+
+def _unique_features(model: PySATModel) -> list[Any]:
+    counts = model.get_ddnnf().literal_counts()
+    return [name for name, variable in model.variables.items() if counts.get(variable) == 1]
+
+
+def unique_features_sat(model: PySATModel) -> list[Any]:
+    """Return the features selected in exactly one configuration with at most two SAT calls
+    per feature.
+
+    A second configuration selecting the feature is searched for by blocking the first one
+    on the feature variables, through a selector variable that is retired afterwards, on a
+    scratch solver. Every configuration found is recorded, so a feature already seen in two
+    different configurations is decided without calling the solver. As in the enumeration
+    and the counting, features whose variable appears in no clause are never selected.
+    """
+    clauses = model.get_all_clauses()
+    variables = [var for var in model.variables.values() if var <= clauses.nv]
+    found: set[frozenset[int]] = set()  # selected feature variables of the configurations found
+    # selectors are numbered above every variable, including those of features in no clause
+    selector = max(clauses.nv, max(model.variables.values(), default=0))
+    result = []
+    with Solver(name=model.get_session().solver_name) as solver:
+        clauses.load_into(solver)
+
+        def configuration() -> frozenset[int]:
+            assignment = set(solver.get_model())
+            selected = frozenset(var for var in variables if var in assignment)
+            found.add(selected)
+            return selected
+
+        for name, variable in model.variables.items():
+            if variable > clauses.nv:
+                continue
+            selecting = [selected for selected in found if variable in selected]
+            if len(selecting) >= 2:
+                continue
+            if selecting:
+                first = selecting[0]
+            elif solver.solve(assumptions=[variable]):
+                first = configuration()
+            else:
+                continue  # dead feature
+            selector += 1
+            solver.add_clause([-selector] + [-var if var in first else var for var in variables])
+            if solver.solve(assumptions=[variable, selector]):
+                configuration()
+            else:
+                result.append(name)
+            solver.add_clause([-selector])
+    return result
@@ -1,12 +1,19 @@
+from .cardinality_encodings import AtMostOneEncoding, CardinalityEncoding
 from .fm_to_pysat import FmToPysat
 from .cnf_to_pysat import CNFReader
 from .dimacs_reader import DimacsReader
 from .dimacs_writer import DimacsWriter
+from .binary_reader import BinaryReader
+from .binary_writer import BinaryWriter
 
 
 __all__ = [
+    'AtMostOneEncoding',
+    'CardinalityEncoding',
     'FmToPysat',
     'CNFReader',
     'DimacsReader',
-    'DimacsWriter'
+    'DimacsWriter',
+    'BinaryReader',
+    'BinaryWriter',
 ]
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import mmap
+import sys
+import zlib
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from flamapy.core.exceptions import FlamaException
+from flamapy.core.models import VariabilityModel
+from flamapy.core.transformations import TextToModel
+
+from flamapy.metamodels.pysat_metamodel.models import PySATClauses, PySATModel
+from .binary_writer import ALIGNMENT, FORMAT_VERSION, MAGIC, PREAMBLE, BinaryWriter
+
+if TYPE_CHECKING:
+    from flamapy.metamodels.pysat_diagnosis_metamodel.models import DiagnosisModel
+
+
+class BinaryReader(TextToModel):
+    """Load a PySATModel (or a DiagnosisModel) written by BinaryWriter.
+
+    The file is memory-mapped and every clause store is copied from it in one block.
+    The model the PySATModel was built from (`original_model`) is not persisted: operations
+    that need it (e.g., false optional features) require passing it as `original_model`.
+
+    :param source_hash: if given, the cache must have been written for this source hash;
+        otherwise it is stale and a FlamaException is raised, as for corrupt (e.g.,
+        truncated or checksum mismatch) files or files written with another format version.
+    :param original_model: the model the cached PySATModel was built from, if available.
+    """
+
+    @staticmethod
+    def get_source_extension() -> str:
+        return 'pysatbin'
+
+    def __init__(self,
+                 path: str,
+                 source_hash: Optional[str] = None,
+                 original_model: Optional[VariabilityModel] = None) -> None:
+        self.path = path
+        self.source_hash = source_hash
+        self.original_model = original_model
+
+    def transform(self) -> PySATModel:
+        with open(self.path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return self._read(buffer)
+
+    def _read(self, buffer: mmap.mmap) -> PySATModel:
+        if len(buffer) < PREAMBLE.size:
+            raise FlamaException(f'{self.path} is not a PySAT binary model.')
+        magic, version, header_size = PREAMBLE.unpack_from(buffer)
+        if magic != MAGIC:
+            raise FlamaException(f'{self.path} is not a PySAT binary model.')
+        if version != FORMAT_VERSION:
+            raise FlamaException(f'{self.path} has format version {version}, '
+                                 f'expected {FORMAT_VERSION}.')
+        if PREAMBLE.size + header_size > len(buffer):
+            raise FlamaException(f'{self.path} is truncated.')
+        header = json.loads(buffer[PREAMBLE.size:PREAMBLE.size + header_size])
+        if self.source_hash is not None and header['source_hash'] != self.source_hash:
+            raise FlamaException(f'{self.path} is stale: it was not built from this source.')
+        data_start = (PREAMBLE.size + header_size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+        stores: dict[str, PySATClauses] = {}
+        if header['extension'] == 'pysat_diagnosis':
+            diagnosis_model = _new_diagnosis_model(header['diagnosis'])
+            stores['set_kb'] = diagnosis_model.set_kb
+            sat_model: PySATModel = diagnosis_model
+        else:
+            sat_model = PySATModel()
+        sat_model.features = dict(header['features'])
+        sat_model.variables = dict(header['variables'])
+        if self.original_model is not None:
+            sat_model.original_model = self.original_model
+        stores['clauses'] = sat_model.get_all_clauses()
+        with memoryview(buffer) as view:
+            if zlib.crc32(view[data_start:]) != header['checksum']:
+                raise FlamaException(f'{self.path} is corrupt: its checksum does not match.')
+            for name, section in header['sections'].items():
+                if not _read_store(view, data_start, section, stores[name]):
+                    raise FlamaException(f'{self.path} is corrupt: the {name} section is '
+                                         'truncated or inconsistent.')
+        return sat_model
+
+
+def content_hash(path: str) -> str:
+    """Return the SHA-256 digest of a file, to key the binary cache of a model built from
+    it. Include the transformation options in the key if they change the model."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_model(cache_path: str,
+                 source_hash: str,
+                 build: Callable[[], PySATModel]) -> PySATModel:
+    """Load the model from the binary cache, or build it and cache it if the cache is
+    missing, corrupt or stale. A model loaded from the cache has no `original_model`.
+
+    :param build: function building the model from its source, e.g.,
+        `lambda: FmToPysat(UVLReader(path).transform()).transform()`
+    """
+    try:
+        return BinaryReader(cache_path, source_hash).transform()
+    except (OSError, ValueError, KeyError, FlamaException):
+        model = build()
+        BinaryWriter(cache_path, model, source_hash).transform()
+        return model
+
+
+def _new_diagnosis_model(diagnosis: dict[str, Any]) -> 'DiagnosisModel':
+    """Return a DiagnosisModel with the diagnosis metadata of the header (its knowledge
+    base is read from its own section)."""
+    # pylint: disable=import-outside-toplevel, cyclic-import
+    from flamapy.metamodels.pysat_diagnosis_metamodel.models import DiagnosisModel
+    model = DiagnosisModel()
+    model.set_c = diagnosis['set_c']
+    model.set_b = diagnosis['set_b']
+    model.constraint_map = {description: PySATClauses(clauses)
+                            for description, clauses in diagnosis['constraint_map']}
+    model.constraint_assumption_map = dict(diagnosis['constraint_assumption_map'])
+    return model
+
+
+def _read_store(view: memoryview,
+                data_start: int,
+                section: list[Any],
+                store: PySATClauses) -> bool:
+    """Fill an empty clause store with the arrays of `section`. Return False if the arrays
+    do not fit in the file or do not form a clause store."""
+    literals, n_literals, offsets, n_offsets, n_variables = section
+    literals += data_start
+    offsets += data_start
+    literals_end = literals + store.literals.itemsize * n_literals
+    offsets_end = offsets + store.offsets.itemsize * n_offsets
+    if max(literals_end, offsets_end) > len(view) or n_offsets < 1:
+        return False
+    store.literals.frombytes(view[literals:literals_end])
+    store.offsets = store.offsets[:0]
+    store.offsets.frombytes(view[offsets:offsets_end])
+    if sys.byteorder != 'little':
+        store.literals.byteswap()
+        store.offsets.byteswap()
+    store.nv = n_variables
+    return (len(store.literals) == n_literals and len(store.offsets) == n_offsets
+            and store.offsets[0] == 0 and store.offsets[-1] == n_literals)
@@ -0,0 +1,123 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import IO, TYPE_CHECKING, Any, Iterator, Optional, cast
+
+from flamapy.core.transformations import ModelToText
+
+from flamapy.metamodels.pysat_metamodel.models import PySATClauses, PySATModel
+
+if TYPE_CHECKING:
+    from flamapy.metamodels.pysat_diagnosis_metamodel.models import DiagnosisModel
+
+
+# File layout: preamble (magic, format version, header length), JSON header, and the
+# little-endian arrays of the clause stores, each aligned to 8 bytes. The header holds the
+# feature maps, the diagnosis metadata, the source hash, the position of every array and
+# the CRC-32 of the arrays (from the end of the header padding to the end of the file).
+MAGIC = b'FLPYSAT\x00'
+FORMAT_VERSION = 2
+PREAMBLE = struct.Struct('<8sIQ')
+ALIGNMENT = 8
+
+
+class BinaryWriter(ModelToText):
+    """Write a PySATModel (or a DiagnosisModel) in the binary cache format read by
+    BinaryReader. The model it was built from (`original_model`) is not written.
+
+    :param source_hash: content hash of the model the PySATModel was built from (see
+        `content_hash`), stored so that stale caches are detected when loading.
+    """
+
+    @staticmethod
+    def get_destination_extension() -> str:
+        return 'pysatbin'
+
+    def __init__(self,
+                 path: str,
+                 source_model: PySATModel,
+                 source_hash: Optional[str] = None) -> None:
+        self.path = path
+        self.source_model = source_model
+        self.source_hash = source_hash
+
+    def transform(self) -> str:
+        # written to a temporary file and renamed, so concurrent readers never see a
+        # partially written cache
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as file:
+            try:
+                write_binary(self.source_model, file, self.source_hash)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, self.path)
+        return ''
+
+
+def write_binary(model: PySATModel, file: IO[bytes], source_hash: Optional[str] = None) -> None:
+    stores = {'clauses': model.get_all_clauses()}
+    header: dict[str, Any] = {
+        'extension': model.get_extension(),
+        'source_hash': source_hash,
+        'features': list(model.features.items()),
+        'variables': list(model.variables.items()),
+    }
+    if model.get_extension() == 'pysat_diagnosis':
+        diagnosis_model = cast('DiagnosisModel', model)
+        stores['set_kb'] = diagnosis_model.set_kb
+        header['diagnosis'] = {
+            'set_c': diagnosis_model.set_c,
+            'set_b': diagnosis_model.set_b,
+            'constraint_map': [(description, list(clauses)) for description, clauses
+                               in diagnosis_model.constraint_map.items()],
+            'constraint_assumption_map':
+                list(diagnosis_model.constraint_assumption_map.items()),
+        }
+
+    # array positions are relative to the end of the header, padded to the alignment
+    sections: dict[str, list[int]] = {}
+    position = 0
+    for name, store in stores.items():
+        literals = position
+        position = _align(literals + store.literals.itemsize * len(store.literals))
+        offsets = position
+        position = _align(offsets + store.offsets.itemsize * len(store.offsets))
+        sections[name] = [literals, len(store.literals), offsets, len(store.offsets), store.nv]
+    header['sections'] = sections
+    checksum = 0
+    for chunk in _payload(stores, sections):
+        checksum = zlib.crc32(chunk, checksum)
+    header['checksum'] = checksum
+    encoded = json.dumps(header).encode('utf8')
+    data_start = _align(PREAMBLE.size + len(encoded))
+
+    file.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+    file.write(encoded)
+    file.write(bytes(data_start - PREAMBLE.size - len(encoded)))
+    for chunk in _payload(stores, sections):
+        file.write(chunk)
+
+
+def _payload(stores: dict[str, PySATClauses],
+             sections: dict[str, list[int]]) -> Iterator[bytes]:
+    """Yield the bytes written after the header: the arrays and their padding."""
+    written = 0
+    for name, store in stores.items():
+        literals, _, offsets, _, _ = sections[name]
+        for values, position in ((store.literals, literals), (store.offsets, offsets)):
+            yield bytes(position - written)
+            if sys.byteorder != 'little':
+                values = array(values.typecode, values)
+                values.byteswap()
+            yield values.tobytes()
+            written = position + values.itemsize * len(values)
+
+
+def _align(position: int) -> int:
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
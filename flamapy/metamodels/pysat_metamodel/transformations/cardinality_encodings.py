@@ -0,0 +1,237 @@
+"""
+CNF encodings of cardinality constraints over a list of literals.
+
+The cardinality encodings build a unary counter: a list of outputs where output j
+(0-based) holds if and only if at least j + 1 of the input literals hold. The at-most-one
+encodings are specialized for alternative groups.
+
+The auxiliary variables are always defined by equivalences, so they are fully determined
+by the inputs: encoding a constraint this way does not change the number of models of the
+formula, nor the configurations enumerated from it.
+"""
+import itertools
+import math
+from enum import Enum
+from typing import Callable, Optional
+
+
+Clauses = list[list[int]]
+NewVariable = Callable[[], int]
+
+
+class CardinalityEncoding(Enum):
+    """Available encodings for group cardinalities [min..max]."""
+    COMBINATIONS = 'combinations'  # one clause per forbidden subset, exponential
+    SEQUENTIAL_COUNTER = 'seqcounter'  # O(n·k) clauses and auxiliary variables
+    TOTALIZER = 'totalizer'  # O(n·k) clauses, O(n·log n) auxiliary variables
+    SORTING_NETWORK = 'sortnetwrk'  # O(n·log² n) clauses and auxiliary variables
+
+
+class AtMostOneEncoding(Enum):
+    """Available encodings for the at-most-one part of alternative groups."""
+    PAIRWISE = 'pairwise'  # O(n²) clauses, no auxiliary variables
+    LADDER = 'ladder'  # sequential encoding, O(n) clauses and auxiliary variables
+    COMMANDER = 'commander'  # O(n) clauses, n/2 auxiliary variables
+    PRODUCT = 'product'  # O(n) clauses, O(√n) auxiliary variables
+
+
+def unary_counter(literals: list[int],
+                  bound: int,
+                  new_variable: NewVariable,
+                  encoding: CardinalityEncoding) -> tuple[Clauses, list[int]]:
+    """Return the clauses and the first `bound` outputs of a unary counter of `literals`.
+
+    :param literals: the literals to be counted
+    :param bound: number of outputs required (it is truncated to the number of literals)
+    :param new_variable: function returning a fresh variable id
+    :param encoding: the encoding to use (COMBINATIONS is not a counter)
+    """
+    bound = min(bound, len(literals))
+    if bound <= 0:
+        return [], []
+    if encoding == CardinalityEncoding.SEQUENTIAL_COUNTER:
+        return sequential_counter(literals, bound, new_variable)
+    if encoding == CardinalityEncoding.TOTALIZER:
+        return totalizer(literals, bound, new_variable)
+    if encoding == CardinalityEncoding.SORTING_NETWORK:
+        return sorting_network(literals, bound, new_variable)
+    raise ValueError(f'{encoding} does not build a unary counter.')
+
+
+def sequential_counter(literals: list[int],
+                       bound: int,
+                       new_variable: NewVariable) -> tuple[Clauses, list[int]]:
+    """Sinz's sequential counter with both implication directions.
+
+    s[i][j] <=> s[i-1][j] or (x_i and s[i-1][j-1]), i.e., at least j + 1 of x_1..x_i.
+    """
+    clauses: Clauses = []
+    previous: list[int] = []  # outputs over x_1..x_{i-1}
+    for literal in literals:
+        current: list[int] = []
+        for j in range(min(bound, len(previous) + 1)):
+            # missing `before` means false, missing `carry` (j == 0) means true
+            before = [previous[j]] if j < len(previous) else []
+            carry = [previous[j - 1]] if j > 0 else []
+            if not before and not carry:
+                current.append(literal)
+                continue
+            out = new_variable()
+            clauses.extend([[-lit, out] for lit in before])
+            clauses.append([-literal] + [-lit for lit in carry] + [out])
+            clauses.append([-out, literal] + before)
+            if carry:
+                clauses.append([-out] + carry + before)
+            current.append(out)
+        previous = current
+    return clauses, previous
+
+
+def totalizer(literals: list[int],
+              bound: int,
+              new_variable: NewVariable) -> tuple[Clauses, list[int]]:
+    """Bailleux and Boufkhad's totalizer, truncated to `bound` outputs, with both
+    implication directions."""
+    clauses: Clauses = []
+
+    def build(leaves: list[int]) -> list[int]:
+        if len(leaves) == 1:
+            return leaves
+        half = len(leaves) // 2
+        left, right = build(leaves[:half]), build(leaves[half:])
+        outputs = [new_variable() for _ in range(min(len(left) + len(right), bound))]
+        for i in range(len(left) + 1):
+            for j in range(len(right) + 1):
+                # left >= i and right >= j -> outputs >= i + j
+                if 0 < i + j <= len(outputs):
+                    clauses.append(([-left[i - 1]] if i > 0 else []) +
+                                   ([-right[j - 1]] if j > 0 else []) +
+                                   [outputs[i + j - 1]])
+                # left < i + 1 and right < j + 1 -> outputs < i + j + 1
+                if i + j < len(outputs):
+                    clauses.append(([left[i]] if i < len(left) else []) +
+                                   ([right[j]] if j < len(right) else []) +
+                                   [-outputs[i + j]])
+        return outputs
+
+    return clauses, build(literals)[:bound]
+
+
+def sorting_network(literals: list[int],
+                    bound: int,
+                    new_variable: NewVariable) -> tuple[Clauses, list[int]]:
+    """Batcher's odd-even merge sorting network whose comparators are encoded with
+    equivalences (max <=> a or b, min <=> a and b). The sorted wires are the outputs."""
+    clauses: Clauses = []
+    size = 1
+    while size < len(literals):
+        size *= 2
+    wires: list[Optional[int]] = list(literals) + [None] * (size - len(literals))
+
+    for first, second in _odd_even_merge_sort(size):
+        upper, lower = wires[first], wires[second]
+        if upper is None or lower is None:
+            # comparing with a constant false wire: max is the other wire, min is false
+            wires[first], wires[second] = upper if lower is None else lower, None
+            continue
+        maximum, minimum = new_variable(), new_variable()
+        clauses.extend([[-upper, maximum], [-lower, maximum], [-maximum, upper, lower],
+                        [-minimum, upper], [-minimum, lower], [-upper, -lower, minimum]])
+        wires[first], wires[second] = maximum, minimum
+    return clauses, [wire for wire in wires[:bound] if wire is not None]
+
+
+def _odd_even_merge_sort(size: int) -> list[tuple[int, int]]:
+    """Comparators of Batcher's odd-even merge sort for `size` (a power of two) wires."""
+    comparators = []
+    block = 1
+    while block < size:
+        step = block
+        while step >= 1:
+            for start in range(step % block, size - step, 2 * step):
+                for i in range(min(step, size - start - step)):
+                    if (i + start) // (block * 2) == (i + start + step) // (block * 2):
+                        comparators.append((i + start, i + start + step))
+            step //= 2
+        block *= 2
+    return comparators
+
+
+def at_most_one(literals: list[int],
+                new_variable: NewVariable,
+                encoding: AtMostOneEncoding) -> Clauses:
+    """Return the clauses forcing at most one of `literals` to hold."""
+    if encoding == AtMostOneEncoding.LADDER:
+        return ladder(literals, new_variable)
+    if encoding == AtMostOneEncoding.COMMANDER:
+        return commander(literals, new_variable)
+    if encoding == AtMostOneEncoding.PRODUCT:
+        return product(literals, new_variable)
+    return pairwise(literals)
+
+
+def pairwise(literals: list[int]) -> Clauses:
+    return [[-first, -second] for first, second in itertools.combinations(literals, 2)]
+
+
+def ladder(literals: list[int], new_variable: NewVariable) -> Clauses:
+    """Sequential (ladder) encoding: s_i <=> x_1 or .. or x_i, and s_{i-1} -> not x_i."""
+    clauses: Clauses = []
+    if len(literals) < 2:
+        return clauses
+    previous = literals[0]
+    for literal in literals[1:-1]:
+        current = new_variable()
+        clauses.extend([[-literal, current], [-previous, current],
+                        [-current, previous, literal], [-previous, -literal]])
+        previous = current
+    clauses.append([-previous, -literals[-1]])
+    return clauses
+
+
+def commander(literals: list[int], new_variable: NewVariable, group_size: int = 3) -> Clauses:
+    """Klieber and Kwon's commander encoding: at most one literal per group, and at most
+    one commander (c <=> some literal of its group) recursively."""
+    if len(literals) <= group_size + 1:
+        return pairwise(literals)
+    clauses: Clauses = []
+    commanders = []
+    for start in range(0, len(literals), group_size):
+        group = literals[start:start + group_size]
+        clauses.extend(pairwise(group))
+        command = new_variable()
+        clauses.extend([[-literal, command] for literal in group])
+        clauses.append([-command] + group)
+        commanders.append(command)
+    clauses.extend(commander(commanders, new_variable, group_size))
+    return clauses
+
+
+def product(literals: list[int], new_variable: NewVariable) -> Clauses:
+    """Chen's product encoding: the literals are laid out on a grid, and at most one row
+    and one column (row/column <=> some of its literals) may be selected, recursively."""
+    if len(literals) <= 4:
+        return pairwise(literals)
+    n_rows = math.ceil(math.sqrt(len(literals)))
+    n_columns = math.ceil(len(literals) / n_rows)
+    rows: list[list[int]] = [[] for _ in range(n_rows)]
+    columns: list[list[int]] = [[] for _ in range(n_columns)]
+    for index, literal in enumerate(literals):
+        rows[index // n_columns].append(literal)
+        columns[index % n_columns].append(literal)
+
+    clauses: Clauses = []
+    selectors = []
+    for lines in (rows, columns):
+        line_selectors = []
+        for line in lines:
+            if not line:
+                continue
+            selector = new_variable()
+            clauses.extend([[-literal, selector] for literal in line])
+            clauses.append([-selector] + line)
+            line_selectors.append(selector)
+        selectors.append(line_selectors)
+    for line_selectors in selectors:
+        clauses.extend(product(line_selectors, new_variable))
+    return clauses
@@ -1,11 +1,31 @@
-from typing import Optional
+import bz2
+import gzip
+import itertools
+import lzma
+import operator
+import re
+from array import array
+from typing import BinaryIO, Optional
 
 from flamapy.core.exceptions import FlamaException
 from flamapy.core.transformations import TextToModel
-from flamapy.metamodels.pysat_metamodel.models import PySATModel
+from flamapy.metamodels.pysat_metamodel.models import PySATClauses, PySATModel
+
+
+# comment, problem and SATLIB end-of-data ('%') lines
+_HEADER_LINE = re.compile(rb'^[ \t]*[cp%][^\n]*', re.MULTILINE)
+_ZERO = b'0'
 
 
 class DimacsReader(TextToModel):
+    """Read a DIMACS file, optionally compressed with gzip, xz or bzip2.
+
+    The file is parsed in one streaming pass over chunks of `chunk_size` bytes. Clauses may
+    span several lines, and the literals of each chunk are converted and loaded into the
+    model's clause store in bulk. Comments of the form `c <id> <name>` name the features.
+    """
+
+    chunk_size = 1 << 20
 
     @staticmethod
     def get_source_extension() -> str:
@@ -15,46 +35,84 @@ class DimacsReader(TextToModel):
         self.path = path
 
     def transform(self) -> PySATModel:
-        with open(self.path, 'r', encoding='utf-8') as file:
-            lines = file.read().splitlines()
-            problem: Optional[str] = None
-            features_lines = []
-            clauses_lines = []
-            for line in lines:
-                if line.startswith('c'):
-                    features_lines.append(line)
-                elif line.startswith('p'):
-                    problem = line
-                elif line != '':
-                    clauses_lines.append(line)
-            if problem is None:
-                raise FlamaException(f'Incorrect Dimacs format of {self.path}. '
-                                     f'No problem statement.')
-
-            problem_list = problem.split()
-            n_clauses = int(problem_list[3])
-            if n_clauses != len(clauses_lines):
-                raise FlamaException(f'Incorrect Dimacs format of {self.path}. '
-                                     f'Inconsistent number of clauses.')
-        features, variables = self._parse_features_variables(features_lines)
         sat_model = PySATModel()
-        sat_model.features = features
-        sat_model.variables = variables
-        self._parse_clauses(sat_model, clauses_lines)
+        clauses = sat_model.get_all_clauses()
+        problem: Optional[bytes] = None
+        pending = array('i')  # literals of a clause not terminated yet
+        ended = False  # a '%' line was found
+
+        with _open_binary(self.path) as file:
+            rest = b''
+            while not ended:
+                chunk = file.read(self.chunk_size)
+                data = rest + chunk
+                if chunk:
+                    # keep the last incomplete line for the next chunk
+                    cut = data.rfind(b'\n') + 1
+                    data, rest = data[:cut], data[cut:]
+                start = 0
+                for match in _HEADER_LINE.finditer(data):
+                    pending = _parse_literals(clauses, data[start:match.start()], pending)
+                    start = match.end()
+                    line = match.group().strip()
+                    if line.startswith(b'c'):
+                        self._parse_feature(sat_model, line)
+                    elif line.startswith(b'p'):
+                        problem = line
+                    else:
+                        ended = True
+                        break
+                if not ended:
+                    pending = _parse_literals(clauses, data[start:], pending)
+                if not chunk:
+                    break
+
+        if problem is None:
+            raise FlamaException(f'Incorrect Dimacs format of {self.path}. '
+                                 f'No problem statement.')
+        if len(pending) > 0:
+            clauses.extend_flat(pending, [len(pending)])
+        problem_list = problem.split()
+        n_clauses = int(problem_list[3])
+        if n_clauses != len(clauses):
+            raise FlamaException(f'Incorrect Dimacs format of {self.path}. '
+                                 f'Inconsistent number of clauses.')
         return sat_model
 
-    def _parse_features_variables(self, lines: list[str]) -> tuple[dict[int, str], dict[str, int]]:
-        features: dict[int, str] = {}
-        variables: dict[str, int] = {}
-        for line in lines:
-            line_list = line.split()
-            var = int(line_list[1])
-            feature = line_list[2]
-            features[var] = feature
-            variables[feature] = var
-        return (features, variables)
-
-    def _parse_clauses(self, sat_model: PySATModel, lines: list[str]) -> None:
-        for line in lines:
-            clause = line.split()
-            sat_model.add_clause([int(c) for c in clause if c != '0'])
+    @staticmethod
+    def _parse_feature(sat_model: PySATModel, line: bytes) -> None:
+        line_list = line.decode('utf-8').split()
+        if len(line_list) < 3 or not line_list[1].isdigit():
+            return  # a regular comment
+        var = int(line_list[1])
+        feature = line_list[2]
+        sat_model.features[var] = feature
+        sat_model.variables[feature] = var
+
+
+def _parse_literals(clauses: PySATClauses, data: bytes, pending: 'array[int]') -> 'array[int]':
+    """Load the clauses in `data` into the store and return the literals of the last clause
+    if it is not terminated."""
+    tokens = data.split()
+    if not tokens:
+        return pending
+    run = pending + array('i', map(int, itertools.filterfalse(_ZERO.__eq__, tokens)))
+    zeros = list(itertools.compress(itertools.count(), map(_ZERO.__eq__, tokens)))
+    if not zeros:
+        return run
+    # the k-th zero, at token position p, ends a clause at position len(pending) + p - k
+    ends = list(map(operator.sub, zeros, itertools.count(-len(pending))))
+    clauses.extend_flat(run[:ends[-1]], ends)
+    return run[ends[-1]:]
+
+
+def _open_binary(path: str) -> BinaryIO:
+    with open(path, 'rb') as file:
+        magic = file.read(6)
+    if magic.startswith(b'\x1f\x8b'):
+        return gzip.open(path, 'rb')  # type: ignore[return-value]
+    if magic.startswith(b'\xfd7zXZ\x00'):
+        return lzma.open(path, 'rb')  # type: ignore[return-value]
+    if magic.startswith(b'BZh'):
+        return bz2.open(path, 'rb')  # type: ignore[return-value]
+    return open(path, 'rb')
@@ -1,33 +1,106 @@
+import bz2
+import contextlib
+import gzip
+import io
+import itertools
+import lzma
+from typing import IO, Any, BinaryIO, Callable, Iterator, Optional, TextIO, Union, cast
+
+from flamapy.core.exceptions import FlamaException
 from flamapy.core.transformations import ModelToText
 
 from flamapy.metamodels.pysat_metamodel.models import PySATModel
 
 
+_COMPRESSORS: dict[str, Callable[..., IO[Any]]] = {
+    'gzip': gzip.open,
+    'xz': lzma.open,
+    'bz2': bz2.open,
+}
+_EXTENSIONS = {'.gz': 'gzip', '.xz': 'xz', '.bz2': 'bz2'}
+
+
 class DimacsWriter(ModelToText):
+    """Write a PySATModel in DIMACS format.
+
+    `transform` returns the DIMACS text and, if `path` is set, also writes it to `path`,
+    which is either a file name or a file-like object. For large models, `stream` writes
+    it to `path` in chunks of `chunk_size` clauses instead, without holding the text in
+    memory. The output is compressed with `compression` ('gzip', 'xz' or 'bz2'); for file
+    names it is inferred from the extension (.gz, .xz, .bz2) by default.
+    """
+
+    chunk_size = 10000
 
     @staticmethod
     def get_destination_extension() -> str:
         return 'dimacs'
 
-    def __init__(self, path: str, source_model: PySATModel) -> None:
+    def __init__(self,
+                 path: Union[str, TextIO, BinaryIO, None],
+                 source_model: PySATModel,
+                 compression: Optional[str] = None) -> None:
         self.path = path
         self.source_model = source_model
+        self.compression = compression
 
     def transform(self) -> str:
         dimacs_str = pysat_to_dimacs(self.source_model)
         if self.path is not None:
-            with open(self.path, 'w', encoding='utf8') as file:
+            with _open_text(self.path, self.compression) as file:
                 file.write(dimacs_str)
         return dimacs_str
 
+    def stream(self) -> None:
+        """Write the model to `path` without building its DIMACS text."""
+        if self.path is None:
+            raise FlamaException('A path is needed to stream the DIMACS text.')
+        with _open_text(self.path, self.compression) as file:
+            write_dimacs(self.source_model, file, self.chunk_size)
+
 
 def pysat_to_dimacs(model: PySATModel) -> str:
-    lines = []
+    buffer = io.StringIO()
+    write_dimacs(model, buffer)
+    return buffer.getvalue()
+
+
+def write_dimacs(model: PySATModel, file: TextIO, chunk_size: int = 10000) -> None:
+    """Write the model in DIMACS format to a text file, `chunk_size` clauses at a time."""
     features_dict = model.features
-    clauses_list = model.get_all_clauses().clauses
-    lines.append(f'p cnf {len(features_dict)} {len(clauses_list)}')
-    for identification, name in features_dict.items():
-        lines.append(f'c {identification} {name}')
-    for clause in clauses_list:
-        lines.append(f'{" ".join((str(c) for c in clause))} 0')
-    return '\n'.join(lines)
+    clauses = model.get_all_clauses()
+    n_variables = max(len(features_dict), clauses.nv)
+    file.write(f'p cnf {n_variables} {len(clauses)}')
+    file.write(''.join(f'\nc {identification} {name}'
+                       for identification, name in features_dict.items()))
+    remaining = iter(clauses)
+    while chunk := list(itertools.islice(remaining, chunk_size)):
+        file.write(''.join(f'\n{" ".join(map(str, clause))} 0' for clause in chunk))
+
+
+@contextlib.contextmanager
+def _open_text(destination: Union[str, TextIO, BinaryIO],
+               compression: Optional[str]) -> Iterator[TextIO]:
+    if isinstance(destination, str):
+        if compression is None:
+            compression = next((name for extension, name in _EXTENSIONS.items()
+                                if destination.endswith(extension)), None)
+        if compression is None:
+            with open(destination, 'w', encoding='utf8') as file:
+                yield file
+        else:
+            with _COMPRESSORS[compression](destination, 'wt', encoding='utf8') as file:
+                yield file  # type: ignore[misc]
+    elif compression is not None:
+        # closing the compressed stream finalizes it but leaves `destination` open
+        with _COMPRESSORS[compression](destination, 'wt', encoding='utf8') as file:
+            yield file  # type: ignore[misc]
+    elif isinstance(destination, io.TextIOBase):
+        yield destination
+    else:
+        wrapper = io.TextIOWrapper(cast(BinaryIO, destination), encoding='utf8')
+        try:
+            yield wrapper
+        finally:
+            wrapper.flush()
+            wrapper.detach()
@@ -9,9 +9,19 @@ from flamapy.metamodels.fm_metamodel.models.feature_model import (
     Relation,
 )
 from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from .cardinality_encodings import (
+    AtMostOneEncoding,
+    CardinalityEncoding,
+    at_most_one,
+    unary_counter,
+)
 
 
 class FmToPysat(ModelToModel):
+    # Alternative groups up to this size are encoded pairwise regardless of the
+    # alternative encoding: it needs no auxiliary variables and no more clauses.
+    pairwise_group_size = 6
+
     @staticmethod
     def get_source_extension() -> str:
         return 'fm'
@@ -20,8 +30,14 @@ class FmToPysat(ModelToModel):
     def get_destination_extension() -> str:
         return 'pysat'
 
-    def __init__(self, source_model: FeatureModel) -> None:
+    def __init__(self,
+                 source_model: FeatureModel,
+                 cardinality_encoding: CardinalityEncoding = CardinalityEncoding.SEQUENTIAL_COUNTER,
+                 alternative_encoding: AtMostOneEncoding = AtMostOneEncoding.LADDER
+                 ) -> None:
         self.source_model = source_model
+        self.cardinality_encoding = cardinality_encoding
+        self.alternative_encoding = alternative_encoding
         self.counter = 1
         self.destination_model = PySATModel()
         self.destination_model.original_model = source_model
@@ -34,6 +50,13 @@ class FmToPysat(ModelToModel):
             self.destination_model.features[self.counter] = feature.name
             self.counter += 1
 
+    def _new_auxiliary_variable(self) -> int:
+        # Auxiliary variables are numbered after the features and are not registered
+        # in the model's features/variables maps.
+        value = self.counter
+        self.counter += 1
+        return value
+
     def add_root(self, feature: Feature) -> None:
         # self.r_cnf.append([self.destination_model.variables.get(feature.name)])
         value = self.destination_model.get_variable(feature.name)
@@ -75,26 +98,54 @@ class FmToPysat(ModelToModel):
         # add the first cnf child1 or child2 or ... or childN or no parent)
 
         value_parent = self.destination_model.get_variable(relation.parent.name)
+        value_children = [self.destination_model.get_variable(child.name)
+                          for child in relation.children]
         # first elem of the constraint
-        alt_cnf = [-1 * value_parent]
-        for child in relation.children:
-            alt_cnf.append(self.destination_model.get_variable(child.name))
-        clauses = [alt_cnf]
-
-        for i, _ in enumerate(relation.children):
-            for j in range(i + 1, len(relation.children)):
-                if i != j:
-                    clauses.append([
-                        -1 * self.destination_model.get_variable(relation.children[i].name),
-                        -1 * self.destination_model.get_variable(relation.children[j].name)
-                    ])
-            clauses.append([
-                -1 * self.destination_model.get_variable(relation.children[i].name),
-                value_parent
-            ])
+        clauses = [[-1 * value_parent] + value_children]
+
+        if (self.alternative_encoding == AtMostOneEncoding.PAIRWISE
+                or len(value_children) <= self.pairwise_group_size):
+            for i, value_child in enumerate(value_children):
+                for other_child in value_children[i + 1:]:
+                    clauses.append([-1 * value_child, -1 * other_child])
+                clauses.append([-1 * value_child, value_parent])
+            return clauses
+
+        clauses.extend(at_most_one(value_children, self._new_auxiliary_variable,
+                                   self.alternative_encoding))
+        for value_child in value_children:
+            clauses.append([-1 * value_child, value_parent])
         return clauses
 
     def _add_constraint_relation(self, relation: Relation) -> List[List[int]]:
+        if self.cardinality_encoding == CardinalityEncoding.COMBINATIONS:
+            return self._add_constraint_relation_combinations(relation)
+
+        # This is a _min to _max relationship:
+        # parent -> _min <= |selected children| <= _max, and child -> parent
+        value_parent = self.destination_model.get_variable(relation.parent.name)
+        value_children = [self.destination_model.get_variable(child.name)
+                          for child in relation.children]
+        _min = relation.card_min
+        _max = relation.card_max
+
+        # outputs[j] holds iff at least j + 1 children are selected
+        bound = max(_min, _max + 1)
+        clauses, outputs = unary_counter(value_children, bound,
+                                         self._new_auxiliary_variable,
+                                         self.cardinality_encoding)
+        if _min > len(value_children) or _max < 0:
+            clauses.append([-1 * value_parent])
+        else:
+            if _min > 0:
+                clauses.append([-1 * value_parent, outputs[_min - 1]])
+            if _max < len(value_children):
+                clauses.append([-1 * value_parent, -1 * outputs[_max]])
+        for value_child in value_children:
+            clauses.append([-1 * value_child, value_parent])
+        return clauses
+
+    def _add_constraint_relation_combinations(self, relation: Relation) -> List[List[int]]:
         value_parent = self.destination_model.get_variable(relation.parent.name)
 
         # This is a _min to _max relationship
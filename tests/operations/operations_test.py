@@ -1,6 +1,14 @@
+import itertools
+import multiprocessing
+import os
 
+import pytest
+
+from flamapy.core.exceptions import FlamaException
 from flamapy.metamodels.configuration_metamodel.models import Configuration
 from flamapy.metamodels.fm_metamodel.models import Feature
+from flamapy.metamodels.fm_metamodel.transformations import FeatureIDEReader
+from flamapy.metamodels.pysat_metamodel.transformations import FmToPysat
 from flamapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
 from flamapy.metamodels.pysat_metamodel.operations.pysat_core_features import (
     PySATCoreFeatures,
@@ -13,13 +21,33 @@ from flamapy.metamodels.pysat_metamodel.operations.pysat_false_optional_features
 )
 from flamapy.metamodels.pysat_metamodel.operations.pysat_configurations import (
     PySATConfigurations,
+    iter_configurations,
 )
 from flamapy.metamodels.pysat_metamodel.operations.pysat_configurations_number import (
     PySATConfigurationsNumber,
 )
 from flamapy.metamodels.pysat_metamodel.operations.pysat_satisfiable import PySATSatisfiable
+from flamapy.metamodels.pysat_metamodel.operations import pysat_parallel
+from flamapy.metamodels.pysat_metamodel.operations.pysat_parallel import portfolio_solve
+from flamapy.metamodels.pysat_metamodel.operations.pysat_commonality import (
+    PySATCommonality,
+    commonalities,
+)
+from flamapy.metamodels.pysat_metamodel.operations.pysat_backbone import (
+    backbone,
+    core_and_dead_features,
+)
 from flamapy.metamodels.pysat_metamodel.operations.pysat_satisfiable_configuration import (
     PySATSatisfiableConfiguration,
+    PySATSatisfiableConfigurationBatch,
+)
+from flamapy.metamodels.pysat_metamodel.operations.pysat_filter import PySATFilter
+from flamapy.metamodels.pysat_metamodel.operations.pysat_sampling import PySATSampling
+from flamapy.metamodels.pysat_metamodel.operations.pysat_unique_features import (
+    PySATUniqueFeatures
+)
+from flamapy.metamodels.pysat_metamodel.operations.pysat_twise_sampling import (
+    PySATTWiseSampling,
 )
 
 
@@ -1893,3 +1921,441 @@ def test_relationships_requires_excludes() -> None:
         expected_valid_products,
         expected_non_valid_products,
     )
+
+
+def test_solver_session_is_shared_and_incremental() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C"}
+    model.variables = {"A": 1, "B": 2, "C": 3}
+    for clause in [[1], [-1, 2, 3], [-2, 1], [-3, 1]]:
+        model.add_clause(clause)
+
+    session = model.get_session()
+    assert PySATSatisfiable().execute(model).get_result()
+    solver = session.solver
+    assert str(PySATCoreFeatures().execute(model).get_result()) == str(["A"])
+    assert PySATDeadFeatures().execute(model).get_result() == []
+    assert model.get_session() is session
+    assert session.solver is solver
+
+    # Clauses added after the session was created are pushed on the next query
+    model.add_clause([-3])
+    assert str(PySATCoreFeatures().execute(model).get_result()) == str(["A", "B"])
+    assert str(PySATDeadFeatures().execute(model).get_result()) == str(["C"])
+    assert PySATConfigurationsNumber().execute(model).get_result() == 1
+    assert session.solver is solver
+
+
+def test_backbone_core_and_dead_features() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C", 4: "D", 5: "E"}
+    model.variables = {"A": 1, "B": 2, "C": 3, "D": 4, "E": 5}
+    # A root, B mandatory, C and D optional, E optional but excluded by B
+    for clause in [[1], [-1, 2], [-2, 1], [-3, 1], [-4, 1], [-5, 1], [-2, -5]]:
+        model.add_clause(clause)
+
+    assert backbone(model) == {1, 2, -5}
+    assert core_and_dead_features(model) == (["A", "B"], ["E"])
+
+    model.add_clause([-1])
+    assert backbone(model) is None
+    assert core_and_dead_features(model) == ([], ["A", "B", "C", "D", "E"])
+
+
+def test_configurations_number_without_enumeration() -> None:
+
+    model = PySATModel()
+
+    # Root with 60 optional children: 2^60 products, far beyond enumeration
+    model.features = {i: f"F{i}" for i in range(1, 62)}
+    model.variables = {f"F{i}": i for i in range(1, 62)}
+    model.add_clause([1])
+    for child in range(2, 62):
+        model.add_clause([-child, 1])
+
+    products_number = PySATConfigurationsNumber()
+    products_number.execute(model)
+    assert products_number.get_result() == 2 ** 60
+
+    # Adding clauses invalidates the compilation: now F2 excludes F3
+    model.add_clause([-2, -3])
+    assert PySATConfigurationsNumber().execute(model).get_result() == 3 * 2 ** 58
+
+
+def test_configurations_number_matches_enumeration() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C", 4: "D", 5: "E", 6: "F"}
+    model.variables = {"A": 1, "B": 2, "C": 3, "D": 4, "E": 5, "F": 6}
+    # A root, alternative B/C, or-group D/E/F, F requires B
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1],
+                   [-1, 4, 5, 6], [-4, 1], [-5, 1], [-6, 1], [-6, 2]]:
+        model.add_clause(clause)
+
+    products = PySATConfigurations().execute(model).get_result()
+    assert PySATConfigurationsNumber().execute(model).get_result() == len(products) == 10
+
+
+def test_configurations_streaming_limit_and_projection() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C", 4: "D"}
+    model.variables = {"A": 1, "B": 2, "C": 3, "D": 4}
+    # A root with optional children B, C and D: 8 products
+    for clause in [[1], [-2, 1], [-3, 1], [-4, 1]]:
+        model.add_clause(clause)
+
+    stream = iter_configurations(model)
+    first = next(stream)
+    assert first.elements["A"]
+    stream.close()
+
+    all_products = PySATConfigurations().execute(model).get_result()
+    assert len(all_products) == 8
+    assert list(iter_configurations(model, limit=3)) == all_products[:3]
+
+    limited = PySATConfigurations()
+    limited.set_limit(5)
+    assert len(limited.execute(model).get_result()) == 5
+
+    projected = PySATConfigurations()
+    projected.set_projection(["B"])
+    products = projected.execute(model).get_result()
+    assert sorted(str(product) for product in products) == sorted(
+        [str(Configuration({})), str(Configuration({"B": True}))])
+
+    assert list(iter_configurations(model, projection=[])) == [Configuration({})]
+
+
+def test_commonality_by_counting() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C", 4: "D"}
+    model.variables = {"A": 1, "B": 2, "C": 3, "D": 4}
+    # A root, alternative B/C, optional D requiring B: {B}, {B, D}, {C}
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2]]:
+        model.add_clause(clause)
+
+    operation = PySATCommonality()
+    operation.set_configuration(Configuration({"B": True}))
+    assert operation.execute(model).get_result() == 2 / 3
+    operation.set_configuration(Configuration({Feature("D"): True}))
+    assert operation.execute(model).get_commonality() == 1 / 3
+
+    assert commonalities(model) == {"A": 1.0, "B": 2 / 3, "C": 1 / 3, "D": 1 / 3}
+
+
+def test_sampling_is_uniform_and_reproducible() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C", 4: "D"}
+    model.variables = {"A": 1, "B": 2, "C": 3, "D": 4}
+    # A root, alternative B/C, optional D requiring B: {B}, {B, D}, {C}
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2]]:
+        model.add_clause(clause)
+
+    sampling = PySATSampling()
+    sampling.set_sample_size(3000)
+    sampling.set_with_replacement(True)
+    sampling.set_seed(7)
+    products = [str(product) for product in sampling.execute(model).get_sample()]
+    assert len(products) == 3000
+    assert len(set(products)) == 3
+    assert all(800 < products.count(product) < 1200 for product in set(products))
+    assert [str(product) for product in sampling.execute(model).get_result()] == products
+
+    sampling.set_with_replacement(False)
+    sampling.set_sample_size(5)
+    products = [str(product) for product in sampling.execute(model).get_result()]
+    assert len(products) == 3 and len(set(products)) == 3
+
+    sampling.set_sample_size(10)
+    sampling.set_partial_configuration(Configuration({"C": False}))
+    products = sampling.execute(model).get_result()
+    assert sorted(str(product) for product in products) == sorted(
+        [str(Configuration({"A": True, "B": True})),
+         str(Configuration({"A": True, "B": True, "D": True}))])
+
+
+def test_sampling_without_replacement_of_a_large_model() -> None:
+
+    model = PySATModel()
+
+    # a root with 80 optional features: 2**80 configurations
+    model.features = {variable: f"F{variable}" for variable in range(1, 82)}
+    model.variables = {name: variable for variable, name in model.features.items()}
+    model.add_clause([1])
+    for variable in range(2, 82):
+        model.add_clause([-variable, 1])
+
+    sampling = PySATSampling()
+    sampling.set_sample_size(20)
+    sampling.set_with_replacement(False)
+    sampling.set_seed(3)
+    products = [str(product) for product in sampling.execute(model).get_sample()]
+    assert len(products) == 20 and len(set(products)) == 20
+
+
+def test_twise_sampling_covers_valid_interactions() -> None:
+
+    model = PySATModel()
+
+    names = ["A", "B", "C", "D", "E", "F"]
+    model.features = dict(enumerate(names, start=1))
+    model.variables = {name: variable for variable, name in model.features.items()}
+    # A root, alternative B/C, optional D requiring B, optional E and F
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2],
+                   [-5, 1], [-6, 1]]:
+        model.add_clause(clause)
+    products = PySATConfigurations().execute(model).get_result()
+    valid = [{name: name in product.elements for name in names} for product in products]
+
+    for t in (1, 2, 3):
+        twise = PySATTWiseSampling()
+        twise.set_t(t)
+        sample = twise.execute(model).get_sample()
+        statistics = twise.get_statistics()
+
+        assert all(str(product) in map(str, products) for product in sample)
+        assert len(sample) < len(products)
+        assert statistics["configurations"] == len(sample)
+        assert statistics["coverage"] == 1.0
+        assert statistics["covered_interactions"] == statistics["valid_interactions"]
+        interactions = set()
+        for selection in valid:
+            for features in itertools.combinations(names, t):
+                interactions.add(tuple((name, selection[name]) for name in features))
+        assert statistics["valid_interactions"] == len(interactions)
+        assert (statistics["valid_interactions"] + statistics["invalid_interactions"] ==
+                statistics["interactions"])
+
+
+def test_twise_sampling_of_a_large_model() -> None:
+
+    model = PySATModel()
+
+    # a root with 80 optional features: 2**80 configurations, never enumerated
+    model.features = {variable: f"F{variable}" for variable in range(1, 82)}
+    model.variables = {name: variable for variable, name in model.features.items()}
+    model.add_clause([1])
+    for variable in range(2, 82):
+        model.add_clause([-variable, 1])
+
+    twise = PySATTWiseSampling()
+    twise.set_seed(1)
+    sample = twise.execute(model).get_sample()
+    statistics = twise.get_statistics()
+    # pairs of optional features, in any of the 4 combinations, or with the root selected
+    assert statistics["valid_interactions"] == 4 * 80 * 79 // 2 + 2 * 80
+    assert statistics["interactions"] == 4 * 81 * 80 // 2
+    assert statistics["coverage"] == 1.0
+    assert len(sample) == statistics["configurations"] <= 16
+    selections = [{name: name in product.elements for name in model.variables}
+                  for product in sample]
+    for first, second in itertools.combinations(list(model.variables)[1:], 2):
+        assert {(selection[first], selection[second]) for selection in selections} == {
+            (True, True), (True, False), (False, True), (False, False)}
+
+
+def test_parallel_analysis_matches_sequential() -> None:
+
+    feature_model = FeatureIDEReader("./tests/resources/smartwatch_deadfeature.fide").transform()
+
+    for operation_class in (PySATCoreFeatures, PySATDeadFeatures, PySATFalseOptionalFeatures):
+        sequential = operation_class().execute(FmToPysat(feature_model).transform())
+        parallel = operation_class()
+        parallel.set_processes(2)
+        parallel.execute(FmToPysat(feature_model).transform())
+        assert parallel.get_result()
+        assert [str(f) for f in parallel.get_result()] == [str(f) for f in sequential.get_result()]
+
+
+def test_batch_validation_with_cores() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C", 4: "D"}
+    model.variables = {"A": 1, "B": 2, "C": 3, "D": 4}
+    # A root, alternative B/C, optional D requiring B: {B}, {B, D}, {C}
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2]]:
+        model.add_clause(clause)
+
+    configurations = [
+        Configuration({"A": True, "B": True}),
+        Configuration({"A": True, "C": True, "D": True}),
+        Configuration({"A": True, "B": True, "C": True}),
+        Configuration({"A": True, "E": True}),
+    ]
+    batch = PySATSatisfiableConfigurationBatch()
+    batch.set_configurations(configurations, is_full=True)
+    batch.set_with_cores(True)
+    assert batch.execute(model).get_result() == [True, False, False, False]
+    cores = batch.get_cores()
+    assert cores[0] is None
+    assert cores[1] is not None and cores[1].elements.get("D") is True
+    assert cores[2] is not None and {"B", "C"} <= set(cores[2].elements)
+    assert cores[3] is not None and cores[3].elements == {"E": True}
+
+    batch.set_configurations([Configuration({"D": True}), Configuration({"C": True, "D": True})],
+                             is_full=False)
+    batch.set_with_cores(False)
+    assert batch.execute(model).get_result() == [True, False]
+    assert not batch.get_cores()
+
+
+def test_configuration_to_assumptions() -> None:
+
+    model = PySATModel()
+
+    model.features = {1: "A", 2: "B", 3: "C"}
+    model.variables = {"A": 1, "B": 2, "C": 3}
+
+    configuration = Configuration({"C": True, Feature("A"): True, "B": False, "X": True})
+    assert model.configuration_to_assumptions(configuration) == ([3, 1, -2], ["X"])
+    assert model.configuration_to_assumptions(configuration, is_full=True) == ([1, -2, 3], ["X"])
+
+    model.variables["D"] = 4
+    model.features[4] = "D"
+    assert model.configuration_to_assumptions(Configuration({"D": True}), True) == (
+        [-1, -2, -3, 4], [])
+
+
+def test_filter_count_limit_and_projection() -> None:
+
+    model = PySATModel()
+
+    names = ["A", "B", "C", "D", "E", "F"]
+    model.features = dict(enumerate(names, start=1))
+    model.variables = {name: variable for variable, name in model.features.items()}
+    # A root, alternative B/C, optional D requiring B, optional E and F
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2],
+                   [-5, 1], [-6, 1]]:
+        model.add_clause(clause)
+
+    operation = PySATFilter()
+    operation.set_configuration(Configuration({"B": True}))
+    products = operation.execute(model).get_result()
+    assert len(products) == 8 and all("B" in product for product in products)
+
+    operation.set_count_only(True)
+    assert operation.execute(model).get_count() == 8
+
+    operation.set_projection(["D"])
+    assert operation.execute(model).get_count() == 2
+    operation.set_count_only(False)
+    assert sorted(operation.execute(model).get_result()) == [[], ["D"]]
+
+    operation.set_projection(None)
+    operation.set_limit(3)
+    assert len(operation.execute(model).get_result()) == 3
+    operation.set_count_only(True)
+    assert operation.execute(model).get_count() == 3
+
+
+def test_analysis_cache_is_shared_and_invalidated(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    model = PySATModel()
+
+    names = ["A", "B", "C", "D"]
+    model.features = dict(enumerate(names, start=1))
+    model.variables = {name: variable for variable, name in model.features.items()}
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2]]:
+        model.add_clause(clause)
+
+    cache = model.get_analysis_cache()
+    assert PySATCoreFeatures().execute(model).get_result() == ["A"]
+    assert PySATDeadFeatures().execute(model).get_result() == []
+    assert cache.misses == 1 and cache.hits == 1  # a single backbone computation
+
+    first = PySATConfigurations().execute(model).get_result()
+    assert len(first) == 3
+    first.clear()
+    assert len(PySATConfigurations().execute(model).get_result()) == 3
+    assert PySATConfigurationsNumber().execute(model).get_result() == 3
+
+    model.add_clause([-4])
+    assert len(model.get_analysis_cache()) == 0
+    assert PySATConfigurationsNumber().execute(model).get_result() == 2
+    assert PySATCoreFeatures().execute(model).get_result() == ["A"]
+    assert PySATDeadFeatures().execute(model).get_result() == ["D"]
+
+    # cached results are returned without compiling the model or building a solver
+    assert PySATSatisfiable().execute(model).get_result()
+    monkeypatch.setattr(model, "get_ddnnf", None)
+    monkeypatch.setattr(model, "get_session", None)
+    assert PySATConfigurationsNumber().execute(model).get_result() == 2
+    assert PySATSatisfiable().execute(model).get_result()
+
+
+def test_unique_features() -> None:
+
+    model = PySATModel()
+
+    names = ["A", "B", "C", "D"]
+    model.features = dict(enumerate(names, start=1))
+    model.variables = {name: variable for variable, name in model.features.items()}
+    # products: {A, B}, {A, B, D}, {A, C}
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2]]:
+        model.add_clause(clause)
+
+    operation = PySATUniqueFeatures()
+    assert operation.execute(model).get_result() == ["C", "D"]
+    operation.set_method("sat")
+    assert operation.execute(model).get_result() == ["C", "D"]
+
+    # a feature in no clause (e.g., declared in a DIMACS comment) is never selected, and
+    # its variable must not be reused by the selectors of the 'sat' method
+    model.features[5] = "E"
+    model.variables["E"] = 5
+    operation.set_method("counting")
+    assert operation.execute(model).get_result() == ["C", "D"]
+    operation.set_method("sat")
+    assert operation.execute(model).get_result() == ["C", "D"]
+
+
+def test_solver_backends_and_portfolio() -> None:
+
+    model = PySATModel()
+
+    names = ["A", "B", "C", "D"]
+    model.features = dict(enumerate(names, start=1))
+    model.variables = {name: variable for variable, name in model.features.items()}
+    for clause in [[1], [-1, 2, 3], [-2, -3], [-2, 1], [-3, 1], [-4, 1], [-4, 2]]:
+        model.add_clause(clause)
+
+    with pytest.raises(FlamaException):
+        model.set_solver_name("unknown")
+    model.set_solver_name("cadical153")
+    assert model.get_session().solver_name == "cadical153"
+    assert PySATCoreFeatures().execute(model).get_result() == ["A"]
+    assert PySATConfigurationsNumber().execute(model).get_result() == 3
+
+    operation = PySATSatisfiable()
+    operation.set_portfolio(["glucose4", "lingeling"])
+    assert operation.execute(model).get_result()
+    assert operation.get_fastest_solver() in ("glucose4", "lingeling")
+    assert portfolio_solve(model, [3, 4], ["minisat22", "maplechrono"])[0] is False
+
+
+def _abort(*_: object) -> None:
+    os._exit(3)  # a racer that dies without answering, as on a native solver abort
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="the racers must inherit the patched module")
+def test_portfolio_fails_when_the_racers_die(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    model = PySATModel()
+    model.add_clause([1])
+
+    monkeypatch.setattr(pysat_parallel, "_race", _abort)
+    with pytest.raises(FlamaException, match="exited with code 3"):
+        portfolio_solve(model, solver_names=["glucose4", "cadical153"])
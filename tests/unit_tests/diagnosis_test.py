@@ -1,3 +1,5 @@
+import random
+import time
 import unittest
 
 from flamapy.metamodels.configuration_metamodel.transformations import ConfigurationBasicReader
@@ -5,6 +7,14 @@ from flamapy.metamodels.fm_metamodel.transformations import FeatureIDEReader
 from flamapy.metamodels.pysat_diagnosis_metamodel.transformations import FmToDiagPysat
 
 from flamapy.metamodels.pysat_diagnosis_metamodel.operations import PySATDiagnosis, PySATConflict
+from flamapy.metamodels.pysat_diagnosis_metamodel.operations.diagnosis import ConsistencyChecker
+from flamapy.metamodels.pysat_diagnosis_metamodel.operations.diagnosis.hsdag import HSDAG
+from flamapy.metamodels.pysat_diagnosis_metamodel.operations.diagnosis.hsdag.labeler import (
+    FastDiagLabeler,
+    FastDiagParameters,
+    QuickXPlainLabeler,
+    QuickXPlainParameters
+)
 
 
 def test_fastdiag_all():
@@ -57,6 +67,62 @@ def test_fastdiag_two():
                       'No conflicts found']
 
 
+def test_fastdiagp_all():
+    """
+    Identify all diagnoses with parallel lookahead consistency checks
+    """
+    feature_model = FeatureIDEReader("./tests/resources/smartwatch_inconsistent.fide").transform()
+    model = FmToDiagPysat(feature_model).transform()
+
+    hsdag_fastdiag = PySATDiagnosis()
+    hsdag_fastdiag.set_processes(2)
+    hsdag_fastdiag.execute(model)
+    result = hsdag_fastdiag.get_result()
+
+    print(result)
+    assert result == ['Diagnoses: [(5) IMPLIES[Smartwatch][Analog]],[(4) IMPLIES[Smartwatch][Cellular]],[(3) OR[NOT[Analog][]][NOT[Cellular][]]]',
+                      'Conflict: [(5) IMPLIES[Smartwatch][Analog], (4) IMPLIES[Smartwatch][Cellular], (3) OR[NOT[Analog][]][NOT[Cellular][]]]']
+
+
+def test_fastdiag_parallel_hsdag():
+    feature_model = FeatureIDEReader("./tests/resources/smartwatch_inconsistent.fide").transform()
+    model = FmToDiagPysat(feature_model).transform()
+
+    hsdag_fastdiag = PySATDiagnosis()
+    hsdag_fastdiag.set_hsdag_processes(2)
+    hsdag_fastdiag.execute(model)
+    result = hsdag_fastdiag.get_result()
+
+    print(result)
+    assert result == ['Diagnoses: [(5) IMPLIES[Smartwatch][Analog]],[(4) IMPLIES[Smartwatch][Cellular]],[(3) OR[NOT[Analog][]][NOT[Cellular][]]]',
+                      'Conflict: [(5) IMPLIES[Smartwatch][Analog], (4) IMPLIES[Smartwatch][Cellular], (3) OR[NOT[Analog][]][NOT[Cellular][]]]']
+
+
+def test_parallel_algorithms_in_parallel_hsdag():
+    """
+    FastDiagP/QuickXPlainP with a parallel HSDAG (the workers label sequentially)
+    """
+    feature_model = FeatureIDEReader("./tests/resources/smartwatch_inconsistent.fide").transform()
+    model = FmToDiagPysat(feature_model).transform()
+
+    hsdag_fastdiag = PySATDiagnosis()
+    hsdag_fastdiag.set_processes(2)
+    hsdag_fastdiag.set_hsdag_processes(2)
+    hsdag_fastdiag.execute(model)
+    assert hsdag_fastdiag.get_result() == [
+        'Diagnoses: [(5) IMPLIES[Smartwatch][Analog]],[(4) IMPLIES[Smartwatch][Cellular]],[(3) OR[NOT[Analog][]][NOT[Cellular][]]]',
+        'Conflict: [(5) IMPLIES[Smartwatch][Analog], (4) IMPLIES[Smartwatch][Cellular], (3) OR[NOT[Analog][]][NOT[Cellular][]]]']
+
+    model = FmToDiagPysat(feature_model).transform()
+    hsdag_quickxplain = PySATConflict()
+    hsdag_quickxplain.set_processes(2)
+    hsdag_quickxplain.set_hsdag_processes(2)
+    hsdag_quickxplain.execute(model)
+    assert hsdag_quickxplain.get_result() == [
+        'Conflict: [(5) IMPLIES[Smartwatch][Analog], (4) IMPLIES[Smartwatch][Cellular], (3) OR[NOT[Analog][]][NOT[Cellular][]]]',
+        'Diagnoses: [(5) IMPLIES[Smartwatch][Analog]],[(4) IMPLIES[Smartwatch][Cellular]],[(3) OR[NOT[Analog][]][NOT[Cellular][]]]']
+
+
 def test_quickxplain_all():
     feature_model = FeatureIDEReader("./tests/resources/smartwatch_inconsistent.fide").transform()
 
@@ -72,6 +138,21 @@ def test_quickxplain_all():
         'Diagnoses: [(5) IMPLIES[Smartwatch][Analog]],[(4) IMPLIES[Smartwatch][Cellular]],[(3) OR[NOT[Analog][]][NOT[Cellular][]]]']
 
 
+def test_quickxplainp_all():
+    feature_model = FeatureIDEReader("./tests/resources/smartwatch_inconsistent.fide").transform()
+    model = FmToDiagPysat(feature_model).transform()
+
+    hsdag_quickxplain = PySATConflict()
+    hsdag_quickxplain.set_processes(2)
+    hsdag_quickxplain.execute(model)
+    result = hsdag_quickxplain.get_result()
+
+    print(result)
+    assert result == [
+        'Conflict: [(5) IMPLIES[Smartwatch][Analog], (4) IMPLIES[Smartwatch][Cellular], (3) OR[NOT[Analog][]][NOT[Cellular][]]]',
+        'Diagnoses: [(5) IMPLIES[Smartwatch][Analog]],[(4) IMPLIES[Smartwatch][Cellular]],[(3) OR[NOT[Analog][]][NOT[Cellular][]]]']
+
+
 def test_quickxplain_one():
     feature_model = FeatureIDEReader("./tests/resources/smartwatch_inconsistent.fide").transform()
     model = FmToDiagPysat(feature_model).transform()
@@ -121,6 +202,21 @@ def test_fastdiag_with_configuration():
                       'Conflict: [E-ink = true, Analog = true]']
 
 
+def test_fastdiagp_with_configuration():
+    feature_model = FeatureIDEReader("./tests/resources/smartwatch_consistent.fide").transform()
+    model = FmToDiagPysat(feature_model).transform()
+    configuration = ConfigurationBasicReader("./tests/resources/smartwatch_nonvalid.csvconf").transform()
+
+    hsdag_fastdiag = PySATDiagnosis()
+    hsdag_fastdiag.set_configuration(configuration)
+    hsdag_fastdiag.set_processes(2)
+    hsdag_fastdiag.execute(model)
+    result = hsdag_fastdiag.get_result()
+
+    assert result == ['Diagnoses: [E-ink = true],[Analog = true]',
+                      'Conflict: [E-ink = true, Analog = true]']
+
+
 def test_quickxplain_with_configuration():
     feature_model = FeatureIDEReader("./tests/resources/smartwatch_consistent.fide").transform()
     model = FmToDiagPysat(feature_model).transform()
@@ -172,5 +268,76 @@ def test_quickxplain_with_testcase():
                       '[(alternative) Screen[1,1]Analog High Resolution E-ink ]']
 
 
+def test_quickxplain_parallel_hsdag_with_testcase():
+    feature_model = FeatureIDEReader("./tests/resources/smartwatch_deadfeature.fide").transform()
+    model = FmToDiagPysat(feature_model).transform()
+
+    test_case = ConfigurationBasicReader("./tests/resources/smartwatch_testcase.csvconf").transform()
+
+    hsdag_quickxplain = PySATConflict()
+    hsdag_quickxplain.set_test_case(test_case)
+    hsdag_quickxplain.set_hsdag_processes(2)
+    hsdag_quickxplain.execute(model)
+    result = hsdag_quickxplain.get_result()
+
+    print(result)
+    assert result == ['Conflict: [(4) IMPLIES[Smartwatch][Analog], '
+                      '(alternative) Screen[1,1]Analog High Resolution E-ink ]',
+                      'Diagnoses: [(4) IMPLIES[Smartwatch][Analog]],'
+                      '[(alternative) Screen[1,1]Analog High Resolution E-ink ]']
+
+
+def test_checker_witnesses_and_memoization():
+    # constraint 10 requires 1, constraint 11 forbids it, constraint 12 requires 2
+    checker = ConsistencyChecker('glucose3', [[1, -10], [-1, -11], [2, -12]], cache_size=1)
+
+    consistent, model = checker.check([10], [])
+    assert consistent and 10 in model and 1 in model and -11 in model
+    consistent, core = checker.check([10, 11, 12], [])
+    assert not consistent and {10, 11} <= set(core) <= {10, 11, 12}
+    assert (checker.hits, checker.misses) == (0, 2)
+
+    assert not checker.is_consistent([10, 11, 12, 13], [])  # contains the core
+    assert checker.is_consistent([], [11])  # satisfied by the model
+    assert (checker.hits, checker.misses) == (2, 2)
+
+    assert checker.is_consistent([11], [])
+    assert checker.is_consistent([10], [])  # its model was evicted
+    assert (checker.hits, checker.misses) == (2, 4)
+    checker.delete()
+
+
+def test_memoization_saves_solver_calls():
+    """
+    Benchmark of the memo: solver calls and time of the HS-dags of random knowledge bases
+    """
+    for labeler_class, parameters_class in ((FastDiagLabeler, FastDiagParameters),
+                                            (QuickXPlainLabeler, QuickXPlainParameters)):
+        results = {}
+        for cache_size in (0, 128):
+            calls, elapsed, labels = 0, 0.0, []
+            for seed in range(5):
+                rng = random.Random(seed)
+                # constraints 13..37, each one requiring two random literals of 1..12
+                constraints = list(range(13, 38))
+                set_kb = [[rng.choice([1, -1]) * rng.randint(1, 12) for _ in range(2)] + [-c]
+                          for c in constraints]
+                checker = ConsistencyChecker('glucose3', set_kb, cache_size)
+                hsdag = HSDAG(labeler_class(checker, parameters_class(constraints, [], [])))
+                hsdag.max_depth = 3
+                start = time.perf_counter()
+                hsdag.construct()
+                elapsed += time.perf_counter() - start
+                calls += checker.misses
+                labels.append((sorted(map(sorted, hsdag.get_diagnoses())),
+                               sorted(map(sorted, hsdag.get_conflicts()))))
+                checker.delete()
+            results[cache_size] = (calls, labels)
+            print(f'{labeler_class.__name__} cache_size={cache_size}: '
+                  f'{calls} solver calls, {elapsed:.3f}s')
+
+        assert results[128][1] == results[0][1]
+        assert results[128][0] < 0.8 * results[0][0]
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,53 @@
+from pysat.solvers import Solver
+
+from flamapy.metamodels.pysat_metamodel.models import PySATClauses, PySATModel
+
+
+def test_clauses_store_behaves_as_a_cnf():
+    clauses = PySATClauses([[1, -2], [2, 3, -4], [-1]])
+    clauses.append([5])
+
+    assert len(clauses) == 4
+    assert clauses.nv == 5
+    assert clauses[1] == [2, 3, -4]
+    assert clauses[-1] == [5]
+    assert list(clauses[1:3]) == [[2, 3, -4], [-1]]
+    assert clauses == [[1, -2], [2, 3, -4], [-1], [5]]
+    assert clauses.to_cnf().clauses == list(clauses)
+
+    with Solver(name='glucose3') as solver:
+        clauses.load_into(solver)
+        assert solver.solve()
+        assert {-1, -2, 5} <= set(solver.get_model())
+
+
+def test_model_clauses_are_compact_and_shared_with_the_session():
+    model = PySATModel()
+    model.add_clauses([[1, 2], [-1, 2]])
+    assert model.get_session().solve([-2]) is False
+
+    model.add_clause([-2])
+    assert model.get_all_clauses().clauses == [[1, 2], [-1, 2], [-2]]
+    assert model.get_session().solve() is False
+
+
+def test_ddnnf_of_a_model_deeper_than_the_recursion_limit():
+    # x1 v x2, x2 v x3, ...: a connected chain that takes one decision per variable
+    n_variables = 1200
+    model = PySATModel()
+    model.add_clauses([[var, var + 1] for var in range(1, n_variables)])
+
+    # the models of the chain are counted by the Fibonacci numbers
+    previous, current = 1, 2
+    for _ in range(n_variables - 1):
+        previous, current = current, previous + current
+    assert model.get_ddnnf().count() == current
+
+
+def test_ddnnf_of_a_model_with_an_empty_clause():
+    model = PySATModel()
+    model.add_clauses([[1, 2], []])
+
+    assert model.get_session().solve() is False
+    assert model.get_ddnnf().count() == 0
+    assert model.get_ddnnf().literal_counts().get(1, 0) == 0
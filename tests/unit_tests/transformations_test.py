@@ -0,0 +1,210 @@
+import gzip
+import io
+from math import comb
+
+import pytest
+
+from flamapy.core.exceptions import FlamaException
+
+from flamapy.metamodels.fm_metamodel.models import Feature, FeatureModel, Relation
+from flamapy.metamodels.pysat_metamodel.transformations import (
+    AtMostOneEncoding,
+    BinaryReader,
+    BinaryWriter,
+    CardinalityEncoding,
+    DimacsReader,
+    DimacsWriter,
+    FmToPysat,
+)
+from flamapy.metamodels.pysat_metamodel.transformations.binary_reader import (
+    cached_model,
+    content_hash,
+)
+from flamapy.metamodels.pysat_diagnosis_metamodel.models import DiagnosisModel
+from flamapy.metamodels.pysat_diagnosis_metamodel.transformations import FmToDiagPysat
+from flamapy.metamodels.pysat_metamodel.operations import (
+    PySATConfigurations,
+    PySATConfigurationsNumber,
+)
+
+
+def _group_model(n_children: int, card_min: int, card_max: int) -> FeatureModel:
+    root = Feature('Root')
+    children = [Feature(f'F{i}', parent=root) for i in range(n_children)]
+    root.add_relation(Relation(root, children, card_min, card_max))
+    return FeatureModel(root)
+
+
+@pytest.mark.parametrize('encoding', list(CardinalityEncoding))
+@pytest.mark.parametrize('card_min, card_max', [(0, 0), (0, 2), (2, 3), (2, 5), (4, 6)])
+def test_cardinality_encodings_are_equivalent(encoding, card_min, card_max):
+    feature_model = _group_model(5, card_min, card_max)
+    model = FmToPysat(feature_model, encoding).transform()
+    reference = FmToPysat(feature_model, CardinalityEncoding.COMBINATIONS).transform()
+
+    assert model.features == reference.features
+    products = PySATConfigurations().execute(model).get_result()
+    expected = PySATConfigurations().execute(reference).get_result()
+    assert sorted(map(str, products)) == sorted(map(str, expected))
+    assert PySATConfigurationsNumber().execute(model).get_result() == len(expected)
+
+
+@pytest.mark.parametrize('encoding', [CardinalityEncoding.SEQUENTIAL_COUNTER,
+                                      CardinalityEncoding.TOTALIZER,
+                                      CardinalityEncoding.SORTING_NETWORK])
+def test_cardinality_encodings_large_group(encoding):
+    model = FmToPysat(_group_model(30, 3, 5), encoding).transform()
+
+    assert len(model.features) == 31
+    assert len(model.get_all_clauses().clauses) < 2000
+    expected = sum(comb(30, k) for k in range(3, 6))
+    assert PySATConfigurationsNumber().execute(model).get_result() == expected
+
+
+@pytest.mark.parametrize('encoding', list(AtMostOneEncoding))
+@pytest.mark.parametrize('n_children', [2, 7, 10, 17])
+def test_alternative_encodings_are_equivalent(encoding, n_children):
+    feature_model = _group_model(n_children, 1, 1)
+    model = FmToPysat(feature_model, alternative_encoding=encoding).transform()
+    reference = FmToPysat(feature_model,
+                          alternative_encoding=AtMostOneEncoding.PAIRWISE).transform()
+
+    products = PySATConfigurations().execute(model).get_result()
+    expected = PySATConfigurations().execute(reference).get_result()
+    assert len(expected) == n_children
+    assert sorted(map(str, products)) == sorted(map(str, expected))
+    assert PySATConfigurationsNumber().execute(model).get_result() == n_children
+
+
+@pytest.mark.parametrize('encoding', [AtMostOneEncoding.LADDER,
+                                      AtMostOneEncoding.COMMANDER,
+                                      AtMostOneEncoding.PRODUCT])
+def test_alternative_encodings_large_group(encoding):
+    model = FmToPysat(_group_model(100, 1, 1), alternative_encoding=encoding).transform()
+
+    assert len(model.features) == 101
+    assert len(model.get_all_clauses().clauses) < 5 * 100
+    assert PySATConfigurationsNumber().execute(model).get_result() == 100
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_dimacs_reader_streaming(tmp_path, compressed):
+    dimacs = ('c 1 Root\nc 2 A\nc a regular comment\np cnf 3 4\n'
+              '1 0 -2 1 0\n-3\n  1\n0\nc 3 B\n2 3 -1 0\n')
+    path = tmp_path / ('model.dimacs.gz' if compressed else 'model.dimacs')
+    with (gzip.open if compressed else open)(path, 'wt') as file:
+        file.write(dimacs)
+
+    reader = DimacsReader(str(path))
+    reader.chunk_size = 5
+    model = reader.transform()
+
+    assert model.features == {1: 'Root', 2: 'A', 3: 'B'}
+    assert model.variables == {'Root': 1, 'A': 2, 'B': 3}
+    assert list(model.get_all_clauses()) == [[1], [-2, 1], [-3, 1], [2, 3, -1]]
+    assert PySATConfigurationsNumber().execute(model).get_result() == 3
+
+
+def test_dimacs_reader_empty_clause(tmp_path):
+    path = tmp_path / 'model.dimacs'
+    path.write_text('p cnf 2 2\nc 1 A\nc 2 B\n1 2 0\n0\n', encoding='utf8')
+    model = DimacsReader(str(path)).transform()
+
+    assert list(model.get_all_clauses()) == [[1, 2], []]
+    assert PySATConfigurationsNumber().execute(model).get_result() == 0
+
+
+def test_dimacs_writer_streaming(tmp_path):
+    model = FmToPysat(_group_model(6, 2, 3)).transform()
+    text = DimacsWriter(None, model).transform()
+    assert text.startswith(f'p cnf {model.get_all_clauses().nv} {len(model.get_all_clauses())}')
+
+    assert DimacsWriter(str(tmp_path / 'copy.dimacs'), model).transform() == text
+    assert (tmp_path / 'copy.dimacs').read_text(encoding='utf8') == text
+
+    for name in ('model.dimacs', 'model.dimacs.xz'):
+        writer = DimacsWriter(str(tmp_path / name), model)
+        writer.chunk_size = 4
+        writer.stream()
+        copy = DimacsReader(str(tmp_path / name)).transform()
+        assert copy.features == model.features
+        assert copy.get_all_clauses() == model.get_all_clauses()
+    assert (tmp_path / 'model.dimacs').read_text(encoding='utf8') == text
+
+    buffer = io.BytesIO()
+    DimacsWriter(buffer, model, compression='gzip').stream()
+    assert gzip.decompress(buffer.getvalue()).decode('utf8') == text
+    with pytest.raises(FlamaException):
+        DimacsWriter(None, model).stream()
+
+
+def test_binary_cache_round_trip(tmp_path):
+    model = FmToPysat(_group_model(8, 2, 4)).transform()
+    path = str(tmp_path / 'model.pysatbin')
+    BinaryWriter(path, model, 'hash').transform()
+
+    copy = BinaryReader(path, 'hash').transform()
+    assert copy.features == model.features
+    assert copy.variables == model.variables
+    assert copy.get_all_clauses() == model.get_all_clauses()
+    assert copy.get_all_clauses().nv == model.get_all_clauses().nv
+    assert (PySATConfigurationsNumber().execute(copy).get_result() ==
+            PySATConfigurationsNumber().execute(model).get_result())
+    with pytest.raises(FlamaException):
+        BinaryReader(path, 'other hash').transform()
+
+    # the source feature model is not persisted, it can be attached when loading
+    assert not hasattr(copy, 'original_model')
+    attached = BinaryReader(path, 'hash', model.original_model).transform()
+    assert attached.original_model is model.original_model
+
+
+def test_binary_cache_diagnosis_model(tmp_path):
+    model = FmToDiagPysat(_group_model(4, 1, 2)).transform()
+    model.prepare_diagnosis_task()
+    path = str(tmp_path / 'model.pysatbin')
+    BinaryWriter(path, model).transform()
+
+    copy = BinaryReader(path).transform()
+    assert isinstance(copy, DiagnosisModel)
+    assert copy.get_kb() == model.get_kb()
+    assert copy.get_c() == model.get_c()
+    assert copy.get_b() == model.get_b()
+    assert copy.constraint_map == model.constraint_map
+    assert copy.constraint_assumption_map == model.constraint_assumption_map
+
+
+def test_cached_model_rebuilds_stale_caches(tmp_path):
+    source = tmp_path / 'model.dimacs'
+    source.write_text('p cnf 2 1\n1 2 0\n', encoding='utf8')
+    cache = str(tmp_path / 'model.pysatbin')
+    built = []
+
+    def build():
+        built.append(True)
+        return DimacsReader(str(source)).transform()
+
+    assert cached_model(cache, content_hash(str(source)), build).get_all_clauses() == [[1, 2]]
+    assert cached_model(cache, content_hash(str(source)), build).get_all_clauses() == [[1, 2]]
+    assert len(built) == 1
+    source.write_text('p cnf 2 1\n-1 2 0\n', encoding='utf8')
+    assert cached_model(cache, content_hash(str(source)), build).get_all_clauses() == [[-1, 2]]
+    assert len(built) == 2
+
+
+def test_binary_cache_detects_truncated_and_corrupt_files(tmp_path):
+    model = FmToPysat(_group_model(8, 2, 4)).transform()
+    path = tmp_path / 'model.pysatbin'
+    BinaryWriter(str(path), model, 'hash').transform()
+    data = path.read_bytes()
+
+    damaged = [data[:-cut] for cut in (8, 64, 400)]
+    damaged.append(data[:-8] + bytes(reversed(data[-8:])))  # same size, different clauses
+    for content in damaged:
+        path.write_bytes(content)
+        with pytest.raises(FlamaException):
+            BinaryReader(str(path), 'hash').transform()
+        rebuilt = cached_model(str(path), 'hash', lambda: model)
+        assert rebuilt.get_all_clauses() == model.get_all_clauses()
+        reloaded = BinaryReader(str(path), 'hash').transform()
+        assert reloaded.get_all_clauses() == model.get_all_clauses()